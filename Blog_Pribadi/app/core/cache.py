@@ -0,0 +1,140 @@
+"""Cache in-process untuk response yang sering dibaca.
+
+`CacheBackend` adalah interface minimal (get/set/delete/clear/stats) yang
+dipakai service. Implementasi default `LRUCache` menyimpan data di memori
+proses dengan batas ukuran (LRU) dan TTL; backend lain (misalnya Redis
+lokal) cukup mengimplementasikan method yang sama.
+
+Pengisian cache setelah membaca database memakai generation: ambil
+`generation()` sebelum membaca, lalu `set(..., generation=...)`. Jika
+key sempat di-`delete`/`clear` di antaranya, nilai (yang mungkin sudah
+basi) tidak disimpan.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class CacheBackend(ABC):
+    """Interface backend cache.
+
+    Nilai `None` tidak pernah disimpan sehingga `get` mengembalikan None
+    untuk menandakan cache miss.
+    """
+
+    @abstractmethod
+    def get(self, key: str):
+        """Mengembalikan nilai untuk `key`, atau None jika miss/expired."""
+
+    @abstractmethod
+    def set(self, key: str, value, ttl: float = None, generation: int = None):
+        """Menyimpan `value` untuk `key` dengan TTL opsional (detik).
+
+        Jika `generation` diberikan dan `key` dihapus setelah generation
+        itu diambil, nilai tidak disimpan.
+        """
+
+    @abstractmethod
+    def generation(self) -> int:
+        """Mengembalikan penanda waktu invalidasi saat ini (lihat `set`)."""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Menghapus satu key dari cache."""
+
+    @abstractmethod
+    def clear(self):
+        """Menghapus seluruh isi cache."""
+
+    @abstractmethod
+    def stats(self):
+        """Mengembalikan metrik cache dalam bentuk dict."""
+
+
+class LRUCache(CacheBackend):
+    """Cache in-memory dengan batas ukuran (LRU) dan TTL.
+
+    Args:
+        maxsize (int): Jumlah maksimal entry sebelum entry terlama dibuang
+        ttl (float): TTL default dalam detik
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # Naik setiap delete/clear; key -> generation saat terakhir dihapus
+        self._generation = 0
+        self._deleted_at = OrderedDict()
+        # Batas atas generation penghapusan key yang tidak tercatat lagi
+        self._deleted_floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value, ttl: float = None, generation: int = None):
+        if value is None:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and self._deleted_at.get(key, self._deleted_floor) > generation:
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+            self._deleted_at[key] = self._generation
+            self._deleted_at.move_to_end(key)
+            # Catatan penghapusan ikut dibatasi; yang dibuang menaikkan floor
+            while len(self._deleted_at) > self.maxsize:
+                _, self._deleted_floor = self._deleted_at.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+            self._deleted_at.clear()
+            self._deleted_floor = self._generation
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
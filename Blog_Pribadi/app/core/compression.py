@@ -0,0 +1,200 @@
+"""Kompresi response (brotli atau gzip) untuk API dan file statis.
+
+`CompressionMiddleware` memilih brotli bila client mengirim
+`Accept-Encoding: br` dan paket `brotli` terpasang, selain itu gzip.
+Response kecil, response yang sudah punya `Content-Encoding` (mis. file
+statis pre-compressed) dan tipe biner seperti gambar tidak dikompresi
+ulang. Response streaming dikompresi per chunk.
+
+Middleware ini ASGI murni (hanya memakai `Headers`/`MutableHeaders`
+Starlette), sehingga tidak bergantung pada detail internal
+`GZipMiddleware` yang berbeda antar versi Starlette.
+
+ETag pada response yang dikompresi dijadikan weak (`W/"..."`) karena
+byte-nya tidak lagi sama dengan representasi aslinya; pengecekan
+`If-None-Match` memakai perbandingan lemah sehingga 304 tetap berlaku.
+"""
+
+import zlib
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli opsional
+    brotli = None
+
+# Tipe yang sudah terkompresi atau harus dikirim apa adanya
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+)
+
+
+def accepted_encodings(accept_encoding: str):
+    """Mengembalikan encoding yang diterima client dari header Accept-Encoding."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        params = params.replace(" ", "")
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            quality = 1.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class _GzipEncoder:
+    """Encoder gzip streaming (zlib dengan header gzip)."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self._compressor.compress(body)
+        return data + self._compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    """Encoder brotli streaming."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self._compressor.process(body)
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class _Responder:
+    """Membungkus `send` satu request dan mengompresi body-nya.
+
+    `http.response.start` ditahan sampai chunk body pertama datang agar
+    header bisa disesuaikan (Content-Encoding, Content-Length, Vary).
+    Tanpa encoder, response hanya diberi `Vary: Accept-Encoding`.
+    """
+
+    def __init__(self, middleware, send, encoding, encoder):
+        self.middleware = middleware
+        self.send = send
+        self.encoding = encoding
+        self.encoder = encoder
+        self.initial_message = None
+        self.started = False
+        self.passthrough = False
+
+    async def __call__(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith(self.middleware.exclude_content_types)
+            )
+            return
+
+        if message_type != "http.response.body" or self.passthrough or self.started:
+            if not self.started:
+                await self._start()
+            if message_type == "http.response.body" and not self.passthrough:
+                message["body"] = await self._compress(message.get("body", b""), message.get("more_body", False))
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not more_body and len(body) < self.middleware.minimum_size:
+            await self._start()
+            await self.send(message)
+            return
+
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoder is None:
+            self.passthrough = True
+        else:
+            headers["Content-Encoding"] = self.encoding
+            message["body"] = await self._compress(body, more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+        await self._start()
+        await self.send(message)
+
+    async def _start(self):
+        self.started = True
+        await self.send(self.initial_message)
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= self.middleware.thread_minimum_size:
+            # Kompresi chunk besar di event loop akan memblokir request lain
+            return await anyio.to_thread.run_sync(self.encoder.compress, body, more_body)
+        return self.encoder.compress(body, more_body)
+
+
+class CompressionMiddleware:
+    """Middleware kompresi brotli/gzip.
+
+    Args:
+        app: Aplikasi ASGI
+        minimum_size (int): Ukuran body minimal (byte) yang dikompresi
+        compresslevel (int): Level gzip (6 seimbang untuk response dinamis)
+        brotli_quality (int): Quality brotli (4 cepat untuk response dinamis)
+        thread_minimum_size (int): Chunk sebesar ini atau lebih dikompresi
+            di thread terpisah
+        exclude_content_types (tuple): Prefix Content-Type yang tidak
+            dikompresi
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 500,
+        compresslevel: int = 6,
+        brotli_quality: int = 4,
+        thread_minimum_size: int = 128 * 1024,
+        exclude_content_types: tuple = EXCLUDED_CONTENT_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.brotli_quality = brotli_quality
+        self.thread_minimum_size = thread_minimum_size
+        self.exclude_content_types = tuple(exclude_content_types)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":  # pragma: no cover
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+        if brotli is not None and "br" in accepted:
+            encoding, encoder = "br", _BrotliEncoder(self.brotli_quality)
+        elif "gzip" in accepted:
+            encoding, encoder = "gzip", _GzipEncoder(self.compresslevel)
+        else:
+            encoding, encoder = None, None
+
+        responder = _Responder(self, _weak_etag_when_encoded(send), encoding, encoder)
+        await self.app(scope, receive, responder)
+
+
+def _weak_etag_when_encoded(send):
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            etag = headers.get("etag")
+            if etag and "content-encoding" in headers and not etag.startswith("W/"):
+                headers["etag"] = "W/" + etag
+        await send(message)
+    return wrapped
@@ -0,0 +1,107 @@
+"""HTTP conditional request: ETag, Last-Modified dan 304 Not Modified.
+
+Handler menghitung validator dari query murah (mis. `count(*)` dan
+`max(updated_at)`) sebelum merender body. Jika validator cocok dengan
+`If-None-Match` / `If-Modified-Since` dari client, handler langsung
+mengembalikan 304 tanpa body.
+
+`If-None-Match` diutamakan (RFC 9110). Koleksi (listing postingan,
+thread komentar) tidak mengirim `Last-Modified`: `max(updated_at)` tidak
+berubah saat row dihapus, sehingga `If-Modified-Since` akan menjawab 304
+untuk isi yang sudah basi. Validator koleksi hanya ETag, yang ikut
+menghitung jumlah row sehingga penghapusan tetap terdeteksi.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """Membuat strong ETag dari nilai-nilai yang menentukan isi response.
+    
+    Args:
+        *parts: Validator (jumlah row, waktu perubahan terakhir, parameter query, ...)
+        
+    Returns:
+        str: ETag dalam tanda kutip, mis. `"3f2a..."`
+    """
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Kolom DateTime menyimpan waktu UTC tanpa timezone (datetime.utcnow)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def http_date(value: datetime) -> str:
+    """Memformat datetime (UTC) sebagai HTTP-date untuk `Last-Modified`."""
+    return format_datetime(_as_utc(value), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime = None) -> bool:
+    """Mengecek apakah salinan milik client masih sama dengan versi server.
+    
+    Args:
+        request (Request): Request dari client
+        etag (str): ETag versi saat ini
+        last_modified (datetime): Waktu perubahan terakhir, None jika tidak diketahui
+        
+    Returns:
+        bool: True jika server boleh menjawab 304
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Perbandingan lemah sesuai RFC 9110 untuk If-None-Match
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified) <= since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime = None):
+    """Menambahkan header `ETag`, `Last-Modified` dan `Cache-Control`.
+    
+    `Cache-Control: no-cache` membuat client selalu memvalidasi ulang
+    salinannya (murah berkat 304) alih-alih memakai salinan basi.
+    
+    Args:
+        response (Response): Response yang akan dikirim
+        etag (str): ETag versi saat ini
+        last_modified (datetime): Waktu perubahan terakhir (opsional)
+        
+    Returns:
+        Response: Response yang sama
+    """
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified(etag: str, last_modified: datetime = None) -> Response:
+    """Membuat response 304 Not Modified (tanpa body) dengan validator.
+    
+    Args:
+        etag (str): ETag versi saat ini
+        last_modified (datetime): Waktu perubahan terakhir (opsional)
+        
+    Returns:
+        Response: Response 304
+    """
+    return set_validators(Response(status_code=304), etag, last_modified)
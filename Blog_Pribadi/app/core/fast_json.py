@@ -0,0 +1,62 @@
+"""Jalur cepat serialisasi JSON untuk endpoint baca yang sering dipanggil.
+
+Secara default FastAPI membangun model Pydantic di service, memvalidasinya
+ulang terhadap `response_model`, lalu men-serialize hasilnya. Bila
+`FAST_JSON` aktif, endpoint listing/detail mengubah row database langsung
+menjadi dict dan bytes JSON lalu mengembalikannya lewat `FastJSONResponse`,
+sehingga FastAPI tidak memvalidasi ulang. Bentuk JSON-nya sama dengan
+response model.
+
+orjson dipakai bila terpasang (`pip install orjson`); tanpa orjson dipakai
+modul `json` bawaan.
+"""
+
+import json
+from datetime import date, datetime
+
+from fastapi.responses import Response
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson opsional
+    orjson = None
+
+
+def enabled():
+    """Mengembalikan True jika jalur cepat diaktifkan lewat `FAST_JSON`."""
+    return settings.FAST_JSON
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data) -> bytes:
+    """Meng-encode dict/list berisi tipe dasar dan datetime menjadi bytes JSON.
+    
+    Args:
+        data: Data yang akan di-encode
+        
+    Returns:
+        bytes: Dokumen JSON (UTF-8)
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """Response JSON yang menerima bytes hasil `dumps` apa adanya.
+    
+    Konten selain bytes di-encode dengan `dumps`.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,125 @@
+"""Layanan hashing password terpusat.
+
+Hashing dan verifikasi pbkdf2_sha256 sengaja dibuat mahal (CPU-bound),
+sehingga dijalankan di `ProcessPoolExecutor` terpisah agar lonjakan
+login/register tidak menghabiskan worker threadpool yang melayani
+endpoint lain. Jumlah pekerjaan yang menunggu dibatasi; bila penuh,
+request ditolak dengan 429 (back-pressure) alih-alih mengantre tanpa batas.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+# 0 worker = hashing dijalankan di threadpool (tanpa process pool)
+HASH_WORKERS = settings.PASSWORD_HASH_WORKERS
+if HASH_WORKERS is None:
+    HASH_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+MAX_PENDING_HASHES = settings.PASSWORD_HASH_MAX_PENDING
+if MAX_PENDING_HASHES is None:
+    MAX_PENDING_HASHES = max(1, HASH_WORKERS) * 8
+
+
+def hash_password(password: str):
+    """Hash password menggunakan pbkdf2_sha256 (sinkron).
+    
+    Args:
+        password (str): Password plain text
+        
+    Returns:
+        str: Password yang sudah di-hash
+    """
+    return pwd_context.hash(password)
+
+
+def verify_password(plain, hashed):
+    """Memverifikasi password plain text dengan hash-nya (sinkron).
+    
+    Args:
+        plain (str): Password plain text
+        hashed (str): Password yang sudah di-hash
+        
+    Returns:
+        bool: True jika password cocok, False jika tidak
+    """
+    return pwd_context.verify(plain, hashed)
+
+
+class PasswordHasher:
+    """Menjalankan hashing password di process pool dengan antrean terbatas.
+    
+    Args:
+        workers (int): Jumlah proses worker; 0 untuk memakai threadpool
+        max_pending (int): Jumlah maksimal pekerjaan yang berjalan/menunggu
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Server sedang sibuk, silakan coba lagi",
+                    headers={"Retry-After": "1"}
+                )
+            self._pending += 1
+
+        try:
+            if self.workers == 0:
+                return await run_in_threadpool(fn, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str):
+        """Hash password di worker pool.
+        
+        Raises:
+            HTTPException: 429 jika antrean hashing penuh
+        """
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain, hashed):
+        """Memverifikasi password di worker pool.
+        
+        Raises:
+            HTTPException: 429 jika antrean hashing penuh
+        """
+        return await self._run(verify_password, plain, hashed)
+
+    def pending(self):
+        """Jumlah pekerjaan hashing yang sedang berjalan atau menunggu."""
+        return self._pending
+
+    def shutdown(self):
+        """Menghentikan process pool (dipanggil saat aplikasi berhenti)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(HASH_WORKERS, MAX_PENDING_HASHES)
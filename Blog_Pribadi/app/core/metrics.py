@@ -0,0 +1,309 @@
+"""Metrik performa per request: latency per route, in-flight dan query database.
+
+`MetricsMiddleware` mengukur setiap request HTTP dan mengelompokkannya
+per method + template route (mis. `/posts/{post_id}`), bukan path asli,
+sehingga jumlah seri metrik tetap kecil. Jumlah dan durasi query
+dihitung lewat event `before_cursor_execute` / `after_cursor_execute`
+pada semua Engine SQLAlchemy (primary, replica dan AsyncEngine).
+
+Endpoint dapat mendeklarasikan batas jumlah query lewat dependency
+`query_budget(n)`. Melebihi batas dicatat sebagai warning, atau
+dijadikan exception `QueryBudgetExceeded` bila `QUERY_BUDGET_MODE=raise`
+(dipakai saat test agar pola N+1 langsung gagal).
+
+Hasilnya tersedia sebagai:
+- header `Server-Timing` di setiap response (`app`, `db` + jumlah query),
+  terlihat di tab Network DevTools browser;
+- teks Prometheus lewat `render()` (endpoint `/metrics` di main.py).
+
+Metrik disimpan per proses; jalankan scrape per worker bila memakai
+beberapa worker.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Batas bucket histogram latency (detik)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class QueryBudgetExceeded(Exception):
+    """Endpoint menjalankan lebih banyak query daripada budget-nya."""
+
+
+class RequestStats:
+    """Statistik database untuk satu request."""
+    __slots__ = ("queries", "db_seconds", "budget", "endpoint", "statements", "budget_warned")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        # Diisi dependency query_budget
+        self.budget = None
+        self.endpoint = None
+        self.statements = []
+        self.budget_warned = False
+
+    def check_budget(self, statement: str):
+        """Dipanggil sebelum setiap query; menindak query di atas budget."""
+        if self.budget is None or self.queries < self.budget:
+            return
+        message = (
+            f"{self.endpoint} exceeded its query budget of {self.budget}: "
+            f"query {self.queries + 1} is {statement!r}; earlier queries: {self.statements}"
+        )
+        if settings.QUERY_BUDGET_MODE == "raise":
+            raise QueryBudgetExceeded(message)
+        if not self.budget_warned:
+            self.budget_warned = True
+            logger.warning(message)
+
+
+# Request yang sedang berjalan; ikut tersalin ke threadpool dan greenlet
+_current_request: ContextVar = ContextVar("metrics_request", default=None)
+
+
+def current_request_stats():
+    """Mengembalikan RequestStats request yang sedang berjalan, atau None."""
+    return _current_request.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_request.get()
+    if stats is not None:
+        stats.check_budget(statement)
+    # Disimpan per eksekusi: jika query gagal, after_cursor_execute tidak
+    # dipanggil dan tidak ada sisa yang menempel di koneksi pool
+    if context is not None:
+        context._metrics_query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_query_start", None)
+    stats = _current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        if started is not None:
+            stats.db_seconds += time.perf_counter() - started
+        stats.statements.append(statement)
+
+
+def query_budget(max_queries: int):
+    """Membuat dependency yang membatasi jumlah query satu endpoint.
+    
+    Budget mencakup semua query request tersebut, termasuk query
+    autentikasi. Hanya berlaku bila MetricsMiddleware aktif.
+    
+    Args:
+        max_queries (int): Jumlah query maksimal per request
+        
+    Returns:
+        Callable: Dependency untuk `dependencies=[Depends(...)]`
+        
+    Example:
+        @router.get("/{post_id}", dependencies=[Depends(query_budget(2))])
+    """
+    async def enforce_query_budget(request: Request):
+        stats = _current_request.get()
+        if stats is None or settings.QUERY_BUDGET_MODE == "off":
+            return
+        route = request.scope.get("route")
+        stats.budget = max_queries
+        stats.endpoint = f"{request.method} {getattr(route, 'path_format', request.url.path)}"
+
+    return enforce_query_budget
+
+
+class _Histogram:
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.buckets[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Penyimpanan metrik per route yang aman dipakai banyak thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.latency = {}    # (method, route) -> _Histogram
+        self.requests = {}   # (method, route, status) -> jumlah
+        self.db_queries = {}  # (method, route) -> jumlah query
+        self.db_seconds = {}  # (method, route) -> total detik query
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            self.latency.setdefault(key, _Histogram()).observe(seconds)
+            status_key = (method, route, status)
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            self.db_queries[key] = self.db_queries.get(key, 0) + stats.queries
+            self.db_seconds[key] = self.db_seconds.get(key, 0.0) + stats.db_seconds
+
+    def reset(self):
+        """Menghapus semua metrik (mis. antar putaran benchmark)."""
+        with self._lock:
+            self.latency.clear()
+            self.requests.clear()
+            self.db_queries.clear()
+            self.db_seconds.clear()
+
+
+registry = MetricsRegistry()
+
+
+def route_label(scope) -> str:
+    """Mengembalikan template route request, mis. `/posts/{post_id}`."""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path_format", None) or route.path
+    if scope.get("root_path"):
+        # Request ke aplikasi yang di-mount (mis. StaticFiles /frontend)
+        return scope["root_path"] + "/{path}"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI yang mencatat latency, status dan query tiap request.
+    
+    Args:
+        app: Aplikasi ASGI
+        registry (MetricsRegistry): Tujuan pencatatan metrik
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        status = 500
+        self.registry.started()
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = (time.perf_counter() - start) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'app;dur={elapsed:.1f}, db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_request.reset(token)
+            self.registry.finished(
+                scope["method"], route_label(scope), status, time.perf_counter() - start, stats
+            )
+
+
+def _labels(**labels) -> str:
+    return ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in labels.items()
+    )
+
+
+def render(registry: MetricsRegistry = registry, caches: dict = None) -> str:
+    """Menghasilkan semua metrik dalam format teks Prometheus (0.0.4).
+    
+    Args:
+        registry (MetricsRegistry): Sumber metrik HTTP/database
+        caches (dict): `{nama: CacheBackend.stats()}` untuk metrik cache
+        
+    Returns:
+        str: Isi response `/metrics`
+    """
+    with registry._lock:
+        latency = {key: (list(h.buckets), h.sum, h.count) for key, h in registry.latency.items()}
+        requests = dict(registry.requests)
+        db_queries = dict(registry.db_queries)
+        db_seconds = dict(registry.db_seconds)
+        in_flight = registry.in_flight
+
+    lines = [
+        "# HELP http_requests_in_flight Requests currently being served",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {in_flight}",
+        "# HELP http_requests_total Requests served, by route and status",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), count in sorted(requests.items()):
+        lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency, by route",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), (buckets, total, count) in sorted(latency.items()):
+        labels = _labels(method=method, route=route)
+        cumulative = 0
+        for bound, bucket in zip(LATENCY_BUCKETS + ("+Inf",), buckets):
+            cumulative += bucket
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {count}")
+
+    lines += [
+        "# HELP db_queries_total Database queries executed while serving requests, by route",
+        "# TYPE db_queries_total counter",
+    ]
+    for (method, route), count in sorted(db_queries.items()):
+        lines.append(f"db_queries_total{{{_labels(method=method, route=route)}}} {count}")
+    lines += [
+        "# HELP db_query_duration_seconds_total Time spent in database queries, by route",
+        "# TYPE db_query_duration_seconds_total counter",
+    ]
+    for (method, route), seconds in sorted(db_seconds.items()):
+        lines.append(f"db_query_duration_seconds_total{{{_labels(method=method, route=route)}}} {seconds:.6f}")
+
+    if caches:
+        for metric, field, help_text in (
+            ("cache_hits_total", "hits", "Cache hits"),
+            ("cache_misses_total", "misses", "Cache misses"),
+            ("cache_evictions_total", "evictions", "Entries evicted to respect maxsize"),
+        ):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for name, stats in sorted(caches.items()):
+                lines.append(f"{metric}{{{_labels(cache=name)}}} {stats.get(field, 0)}")
+        lines += ["# HELP cache_entries Entries currently cached", "# TYPE cache_entries gauge"]
+        for name, stats in sorted(caches.items()):
+            lines.append(f"cache_entries{{{_labels(cache=name)}}} {stats.get('size', 0)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,132 @@
+"""Helper untuk keyset (cursor) pagination.
+
+Listing diurutkan berdasarkan pasangan `(created_at, id)` dan posisi row
+terakhir pada satu halaman dikirim ke client sebagai cursor opaque.
+Halaman berikutnya diambil dengan range scan `(created_at, id) < cursor`
+pada composite index, sehingga biaya halaman ke-N sama dengan halaman 1.
+
+Listing yang diurutkan berdasarkan satu kolom unik (mis. direktori user
+per `username`) memakai `encode_value_cursor` / `decode_value_cursor`.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, row_id: int):
+    """Meng-encode posisi sebuah row menjadi cursor opaque.
+
+    Args:
+        created_at (datetime): Waktu pembuatan row terakhir pada halaman
+        row_id (int): ID row terakhir pada halaman
+
+    Returns:
+        str: Cursor base64 url-safe
+    """
+    raw = json.dumps([created_at.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Men-decode cursor yang dibuat oleh `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor dari response sebelumnya
+
+    Returns:
+        tuple: `(created_at, id)`
+
+    Raises:
+        HTTPException: 400 jika cursor tidak valid
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor tidak valid")
+
+
+def keyset_filter(created_col, id_col, cursor: str, descending: bool = True):
+    """Membuat kondisi WHERE untuk row setelah `cursor`.
+
+    Args:
+        created_col: Kolom `created_at` yang dipakai untuk urutan
+        id_col: Kolom `id` sebagai tie-breaker
+        cursor (str): Cursor dari halaman sebelumnya
+        descending (bool): True jika listing diurutkan terbaru dulu
+
+    Returns:
+        ClauseElement: Kondisi filter SQLAlchemy
+    """
+    created_at, row_id = decode_cursor(cursor)
+    if descending:
+        return or_(
+            created_col < created_at,
+            and_(created_col == created_at, id_col < row_id),
+        )
+    return or_(
+        created_col > created_at,
+        and_(created_col == created_at, id_col > row_id),
+    )
+
+
+def encode_value_cursor(value: str):
+    """Meng-encode nilai kolom unik row terakhir menjadi cursor opaque.
+
+    Args:
+        value (str): Nilai kolom urutan (unik) row terakhir pada halaman
+
+    Returns:
+        str: Cursor base64 url-safe
+    """
+    raw = json.dumps([value]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_value_cursor(cursor: str):
+    """Men-decode cursor yang dibuat oleh `encode_value_cursor`.
+
+    Args:
+        cursor (str): Cursor dari response sebelumnya
+
+    Returns:
+        str: Nilai kolom urutan row terakhir halaman sebelumnya
+
+    Raises:
+        HTTPException: 400 jika cursor tidak valid
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (value,) = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(value, str):
+            raise TypeError(value)
+        return value
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor tidak valid")
+
+
+def next_cursor(rows, limit: int, key):
+    """Mengembalikan cursor halaman berikutnya, atau None di halaman terakhir.
+
+    `rows` berisi maksimal `limit + 1` item; item tambahan hanya menandakan
+    masih ada halaman berikutnya dan dibuang oleh pemanggil.
+
+    Args:
+        rows (list): Hasil query dengan maksimal `limit + 1` item
+        limit (int): Ukuran halaman
+        key (callable): Fungsi yang mengembalikan `(created_at, id)` dari item
+
+    Returns:
+        str | None: Cursor halaman berikutnya
+    """
+    if len(rows) <= limit:
+        return None
+    return encode_cursor(*key(rows[limit - 1]))
@@ -1,19 +1,29 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
+import time
 
+from app.core.cache import LRUCache
 from app.database.db import get_db
-from app.database.models import User
+from app.database.async_db import get_async_db, register_async_dependency
+from app.schema.user_schema import UserResponse
+from app.services import user_service
 
 SECRET_KEY = "blog-secret-key"
 ALGORITHM = "HS256"
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 security = HTTPBearer() 
 
+# Cache token yang sudah diverifikasi -> ID user. TTL entry tidak pernah
+# melewati `exp` token. Username (dan keberadaan user) diambil dari
+# `user_service.username_cache`, yang dihapus setelah commit saat user
+# berubah/dihapus, sehingga cache ini sendiri tidak perlu diinvalidasi.
+TOKEN_CACHE_TTL = 300
+token_cache = LRUCache(maxsize=4096, ttl=TOKEN_CACHE_TTL)
+
 def create_access_token(data: dict):
     """Membuat JWT access token.
     
@@ -37,49 +47,65 @@ def get_current_user(
         credentials: HTTP Bearer token dari header Authorization
         db (Session): Database session
         
+    Token yang sudah pernah diverifikasi diambil dari `token_cache` tanpa
+    decode JWT; bila username user juga ter-cache, tidak ada query database.
+    
     Returns:
-        User: Object User dari database
+        UserResponse: Principal user (id dan username)
         
     Raises:
         HTTPException: 401 jika token tidak valid atau user tidak ditemukan
     """
     token = credentials.credentials
+    # Dipakai RoutingSession untuk read-your-writes setelah client ini menulis
+    db.info["client_key"] = token
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("user_id")
+    user_id = _verified_user_id(token)
+    return _principal(user_id, user_service.get_username(db, user_id))
 
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Token invalid")
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Versi `get_current_user` untuk mode `DB_ASYNC`.
+    
+    Dipakai otomatis oleh `AsyncSessionRoute`; user yang belum ter-cache
+    dicari lewat AsyncSession yang sama dengan endpoint, tanpa threadpool
+    maupun koneksi sync.
+    """
+    token = credentials.credentials
+    db.info["client_key"] = token
 
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
+    user_id = _verified_user_id(token)
+    return _principal(user_id, await user_service.get_username_async(db, user_id))
 
-        return user
+register_async_dependency(get_current_user, get_current_user_async)
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Token invalid")
-    
-def hash_password(password: str):
-    """Hash password menggunakan pbkdf2_sha256.
+def _verified_user_id(token: str):
+    """Mengembalikan user_id dari token (via `token_cache` atau decode JWT).
     
-    Args:
-        password (str): Password plain text
-        
-    Returns:
-        str: Password yang sudah di-hash
+    Raises:
+        HTTPException: 401 jika token tidak valid
     """
-    return pwd_context.hash(password)
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
 
-def verify_password(plain, hashed):
-    """Memverifikasi password plain text dengan hash-nya.
-    
-    Args:
-        plain (str): Password plain text
-        hashed (str): Password yang sudah di-hash
-        
-    Returns:
-        bool: True jika password cocok, False jika tidak
-    """
-    return pwd_context.verify(plain, hashed)
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Token invalid")
+
+    user_id = payload.get("user_id")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Token invalid")
+
+    ttl = min(TOKEN_CACHE_TTL, payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        token_cache.set(token, user_id, ttl=ttl)
+    return user_id
+
+def _principal(user_id: int, username):
+    if username is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return UserResponse(id=user_id, username=username)
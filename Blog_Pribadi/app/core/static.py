@@ -0,0 +1,132 @@
+"""Penyajian file frontend: pre-compressed, cache header dan halaman in-memory.
+
+`python -m app.tools.build_static` menghasilkan `frontend/dist/` berisi
+asset dengan hash konten di namanya (mis. `index.3f2a9c1b7e.js`) beserta
+varian `.br`/`.gz`. `PrecompressedStaticFiles` menyajikan varian tersebut
+sesuai `Accept-Encoding`, memberi asset ber-hash
+`Cache-Control: immutable` (nama berubah setiap isinya berubah) dan file
+lain `no-cache` (selalu divalidasi ulang lewat ETag).
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from app.core.compression import accepted_encodings, brotli
+
+# `nama.<10 hex>.ext` yang dihasilkan build_static
+HASHED_ASSET = re.compile(r"\.[0-9a-f]{10}\.[a-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Urutan preferensi encoding dan suffix file pre-compressed
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def compress_variants(data: bytes):
+    """Mengompresi `data` dengan level maksimal untuk disajikan berulang kali.
+    
+    Args:
+        data (bytes): Isi file
+        
+    Returns:
+        dict: `{encoding: bytes}` untuk `gzip` dan (bila terpasang) `br`
+    """
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    return variants
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles yang menyajikan `file.br` / `file.gz` bila tersedia.
+    
+    Setiap varian punya ETag sendiri (dari stat file-nya) sehingga 304
+    tetap benar per encoding.
+    
+    Args:
+        directory (str): Direktori utama (mis. `frontend/dist`)
+        fallback (str): Direktori yang dicari bila file tidak ada di
+            `directory` (mis. sumber `frontend/`)
+    """
+
+    def __init__(self, *, directory: str, fallback: str = None, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        if fallback is not None:
+            self.all_directories.append(fallback)
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+        cache_control = IMMUTABLE if HASHED_ASSET.search(str(full_path)) else "no-cache"
+
+        response = None
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            # Vary untuk response tanpa encoding ditambahkan CompressionMiddleware
+            response = FileResponse(
+                f"{full_path}{suffix}",
+                status_code=status_code,
+                stat_result=variant_stat,
+                media_type=media_type,
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+            break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+
+        response.headers["Cache-Control"] = cache_control
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class CachedPage:
+    """Halaman HTML yang dibaca sekali lalu disajikan dari memori.
+    
+    Isi dan varian terkompresinya disiapkan saat dibuat, sehingga setiap
+    request tidak lagi menyentuh disk (perubahan file butuh restart).
+    
+    Args:
+        path (str): Path file HTML
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.content = file.read()
+        self.variants = compress_variants(self.content)
+        self.etag = '"' + hashlib.sha256(self.content).hexdigest()[:32] + '"'
+
+    def response(self, request: Request) -> Response:
+        """Membuat response untuk `request` (304 bila ETag masih cocok).
+        
+        Args:
+            request (Request): Request dari client
+            
+        Returns:
+            Response: Halaman HTML, terkompresi bila client mendukung
+        """
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if self.etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        for encoding, _ in ENCODINGS:
+            if encoding in accepted and encoding in self.variants:
+                headers["Content-Encoding"] = encoding
+                return Response(self.variants[encoding], media_type="text/html", headers=headers)
+        return Response(self.content, media_type="text/html", headers=headers)
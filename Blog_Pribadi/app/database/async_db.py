@@ -0,0 +1,174 @@
+"""Async database engine, session factory and routing helpers.
+
+Enabled with `DB_ASYNC=true`. The async engine uses the async driver
+matching `DATABASE_URL` (aiosqlite locally, asyncmy/asyncpg in
+production) and is created lazily so the async drivers are only needed
+when async mode is turned on.
+
+Routers opt in through `AsyncSessionRoute`: in async mode every endpoint
+that depends on `get_db` or `get_read_db` receives an `AsyncSession`
+instead (read replicas are not used in async mode). Other dependencies
+that need the database provide an async variant with
+`register_async_dependency` (e.g. `get_current_user`). Plain `def`
+endpoints are executed through `AsyncSession.run_sync`, so their
+existing ORM code runs on the event loop with non-blocking driver I/O
+instead of holding a threadpool worker for the whole request. Code
+outside the endpoint signature (such as the category map reload) finds
+that session with `current_sync_session`.
+
+Usage:
+    router = APIRouter(prefix="/posts", route_class=AsyncSessionRoute)
+"""
+
+import inspect
+from contextvars import ContextVar
+from functools import wraps
+
+from fastapi import Depends, params
+from fastapi.routing import APIRoute
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.database.db import configure_sqlite, get_db, get_read_db, log_slow_queries
+
+_async_engine = None
+_async_sessionmaker = None
+
+# Sync Session of the AsyncSession whose endpoint is running in run_sync
+_run_sync_session: ContextVar = ContextVar("run_sync_session", default=None)
+
+
+def get_async_engine():
+    """Return the process-wide AsyncEngine, creating it on first use."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        url = settings.async_database_url
+        if make_url(url).get_backend_name() == "sqlite":
+            _async_engine = create_async_engine(url)
+            configure_sqlite(_async_engine.sync_engine)
+        else:
+            _async_engine = create_async_engine(
+                url,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                pool_pre_ping=True,
+            )
+        log_slow_queries(_async_engine.sync_engine)
+        # Objects stay loaded after commit: attributes may be read after
+        # the session has left the greenlet context (e.g. serialization).
+        _async_sessionmaker = async_sessionmaker(
+            bind=_async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def dispose_async_engine():
+    """Close all pooled async connections (called on application shutdown)."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_sessionmaker = None
+
+
+async def get_async_db():
+    """Yield an `AsyncSession` and ensure it is closed afterwards.
+
+    Async counterpart of `get_db` for use with `Depends`.
+
+    Yields:
+        AsyncSession: SQLAlchemy async session instance
+    """
+    get_async_engine()
+    async with _async_sessionmaker() as db:
+        yield db
+
+
+def current_sync_session():
+    """Return the sync `Session` of the endpoint running in `run_sync`, or None.
+
+    Queries on this session go through the request's AsyncSession
+    connection, so they do not block the event loop.
+    """
+    return _run_sync_session.get()
+
+
+# Dependency -> replacement used by AsyncSessionRoute in async mode
+_async_dependencies = {get_db: get_async_db, get_read_db: get_async_db}
+
+
+def register_async_dependency(dependency, async_dependency):
+    """Use `async_dependency` in place of `dependency` in async mode.
+
+    Args:
+        dependency: Sync dependency used in endpoint signatures
+        async_dependency: Coroutine dependency using `get_async_db`
+    """
+    _async_dependencies[dependency] = async_dependency
+
+
+def use_async_session(endpoint):
+    """Rewrite `endpoint` so its dependencies use an AsyncSession.
+
+    Dependencies registered in `_async_dependencies` are swapped for their
+    async variants. Coroutine endpoints receive the `AsyncSession`
+    directly. Sync endpoints with a `get_db` dependency are wrapped in a
+    coroutine that runs them through `AsyncSession.run_sync`, passing the
+    underlying sync `Session`; other sync endpoints keep running in the
+    threadpool. Endpoints without such dependencies are returned unchanged.
+    """
+    signature = inspect.signature(endpoint)
+    name = None
+    replaced = False
+    parameters = []
+    for parameter in signature.parameters.values():
+        default = parameter.default
+        if isinstance(default, params.Depends) and default.dependency in _async_dependencies:
+            if default.dependency in (get_db, get_read_db):
+                name = parameter.name
+            parameter = parameter.replace(default=Depends(
+                _async_dependencies[default.dependency], use_cache=default.use_cache
+            ))
+            replaced = True
+        parameters.append(parameter)
+    if not replaced:
+        return endpoint
+
+    if inspect.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def async_endpoint(**kwargs):
+            return await endpoint(**kwargs)
+    elif name is None:
+        @wraps(endpoint)
+        async def async_endpoint(**kwargs):
+            return await run_in_threadpool(endpoint, **kwargs)
+    else:
+        def run(session, kwargs):
+            token = _run_sync_session.set(session)
+            try:
+                return endpoint(**kwargs, **{name: session})
+            finally:
+                _run_sync_session.reset(token)
+
+        @wraps(endpoint)
+        async def async_endpoint(**kwargs):
+            db: AsyncSession = kwargs.pop(name)
+            return await db.run_sync(run, kwargs)
+
+    async_endpoint.__signature__ = signature.replace(parameters=parameters)
+    return async_endpoint
+
+
+class AsyncSessionRoute(APIRoute):
+    """APIRoute that switches database endpoints to AsyncSession in async mode.
+
+    With `DB_ASYNC` disabled it behaves exactly like `APIRoute`.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        if settings.DB_ASYNC:
+            endpoint = use_async_session(endpoint)
+        super().__init__(path, endpoint, **kwargs)
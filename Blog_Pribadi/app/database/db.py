@@ -1,26 +1,274 @@
 """Database setup and helper for creating sessions.
 
-This module defines the SQLAlchemy engine, session factory and base
+This module defines the SQLAlchemy engines, session factory and base
 declarative class used across the application.
 
+Writes always go to the primary `engine`. When `READ_REPLICA_URLS` is
+configured, sessions from `get_read_db` send their queries to a read
+replica (round-robin, skipping unhealthy ones) until they flush a
+write. A client that has just committed a write is pinned to the
+primary for `READ_YOUR_WRITES_SECONDS` so it always reads its own writes.
+
+Every engine logs statements slower than `SLOW_QUERY_MS` to the
+`app.database.slow_query` logger, with their bound parameters and
+(for SELECTs) the database's EXPLAIN plan.
+
 Usage:
-    from app.database.db import get_db
+    from app.database.db import get_db, get_read_db
     db = next(get_db())  # or use as Depends(get_db) in FastAPI
+    # Depends(get_read_db) for read-only GET handlers
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import itertools
+import logging
+import threading
+import time
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.schema import CreateColumn
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+DATABASE_URL = settings.DATABASE_URL
+
+slow_query_logger = logging.getLogger("app.database.slow_query")
+
+# How each dialect spells "show the plan for this statement"
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "mysql": "EXPLAIN ",
+    "mariadb": "EXPLAIN ",
+    "postgresql": "EXPLAIN ",
+}
+
+
+def configure_sqlite(engine, pragmas: bool = None):
+    """Apply the configured SQLite PRAGMAs on every new connection.
+
+    WAL lets readers run concurrently with a writer, `synchronous=NORMAL`
+    avoids an fsync per commit (safe under WAL), and `busy_timeout` makes
+    concurrent writers wait for the lock instead of failing immediately.
+    Works for sync engines and for `AsyncEngine.sync_engine`.
+
+    Args:
+        engine: SQLAlchemy Engine connected to SQLite
+        pragmas (bool): Override `settings.SQLITE_PRAGMAS`
+    """
+    if not (settings.SQLITE_PRAGMAS if pragmas is None else pragmas):
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}")
+        cursor.close()
+
+
+def explain_statement(conn, statement, parameters):
+    """Return the database's plan for a SELECT `statement`, or None.
+
+    Runs on a separate DBAPI cursor of the same connection, so the
+    statement's own result is left untouched.
+    """
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" | ".join(str(value) for value in row) for row in cursor.fetchall())
+    except Exception as exc:
+        return f"EXPLAIN failed: {exc}"
+    finally:
+        cursor.close()
+
+
+def log_slow_queries(engine, threshold_ms: float = None, explain: bool = None):
+    """Log statements on `engine` that take longer than `threshold_ms`.
+
+    Works for sync engines and for `AsyncEngine.sync_engine`. Streamed
+    (server-side cursor) and executemany statements are logged without
+    a plan.
+
+    Args:
+        engine: SQLAlchemy Engine
+        threshold_ms (float): Override `settings.SLOW_QUERY_MS`; 0 disables
+        explain (bool): Override `settings.SLOW_QUERY_EXPLAIN`
+    """
+    threshold_ms = settings.SLOW_QUERY_MS if threshold_ms is None else threshold_ms
+    explain = settings.SLOW_QUERY_EXPLAIN if explain is None else explain
+    if threshold_ms <= 0:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context rather than the connection: a failed
+        # statement never reaches after_cursor_execute to clean it up
+        if context is not None:
+            context._slow_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_if_slow(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_start", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms < threshold_ms:
+            return
+        plan = None
+        if explain and not executemany and not context.execution_options.get("stream_results"):
+            plan = explain_statement(conn, statement, parameters)
+        slow_query_logger.warning(
+            "slow query (%.1f ms): %s\nparameters: %r%s",
+            elapsed_ms, statement, parameters, f"\nplan:\n{plan}" if plan else "",
+        )
+
+
+def create_db_engine(url: str = DATABASE_URL, sqlite_pragmas: bool = None):
+    """Create an Engine for `url` configured from application settings.
+
+    SQLite gets `check_same_thread=False` (sessions move between server
+    threads) plus the PRAGMAs from `configure_sqlite`; server databases
+    such as MySQL get a sized connection pool with recycling and
+    pre-ping so stale connections are replaced transparently. Slow
+    statements are logged (`log_slow_queries`).
+
+    Args:
+        url (str): Database URL
+        sqlite_pragmas (bool): Override `settings.SQLITE_PRAGMAS`
+
+    Returns:
+        Engine: Configured SQLAlchemy engine
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        configure_sqlite(engine, sqlite_pragmas)
+    else:
+        engine = create_engine(
+            url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=True,
+        )
+    log_slow_queries(engine)
+    return engine
+
+
+# Primary engine: all writes and, without replicas, all reads
+engine = create_db_engine()
+
+
+class ReplicaPool:
+    """Round-robin selection over read replica engines with health checks.
+
+    A replica that raises a connection error is taken out of rotation and
+    only re-admitted after a successful `SELECT 1` once
+    `retry_seconds` have passed. When no replica is healthy, reads fall
+    back to the primary.
+
+    Args:
+        engines (list): Replica engines
+        retry_seconds (float): Delay before an unhealthy replica is re-checked
+    """
+
+    def __init__(self, engines, retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._cycle = itertools.cycle(engines) if engines else None
+        self._unhealthy = {}
+        self._lock = threading.Lock()
+        for replica in engines:
+            event.listen(replica, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        # Lost connection, or failure while opening a new one
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy(context.engine)
+
+    def mark_unhealthy(self, replica):
+        """Take `replica` out of rotation until its next health check."""
+        with self._lock:
+            self._unhealthy[replica] = time.monotonic() + self.retry_seconds
 
-DATABASE_URL = "sqlite:///./blog.db"
+    def _is_healthy(self, replica):
+        with self._lock:
+            retry_at = self._unhealthy.get(replica)
+            if retry_at is None:
+                return True
+            if retry_at > time.monotonic():
+                return False
+            # Reserve the next retry slot so only one caller pings
+            self._unhealthy[replica] = time.monotonic() + self.retry_seconds
 
-# Create SQLAlchemy engine. `check_same_thread` is False to allow
-# usage from different threads which is common in web servers.
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+        try:
+            with replica.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception:
+            return False
+        with self._lock:
+            self._unhealthy.pop(replica, None)
+        return True
+
+    def choose(self):
+        """Return the next healthy replica engine, or None if there is none."""
+        for _ in range(len(self.engines)):
+            with self._lock:
+                replica = next(self._cycle)
+            if self._is_healthy(replica):
+                return replica
+        return None
+
+
+replicas = ReplicaPool(
+    [create_db_engine(url) for url in settings.read_replica_urls],
+    settings.REPLICA_RETRY_SECONDS,
 )
 
+# Clients (by bearer token) that wrote recently and must read from primary
+recent_writers = LRUCache(maxsize=10000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica while `info["read_only"]` is set.
+
+    The replica is chosen once per session so a request sees a consistent
+    snapshot; flushing any change switches the session to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("read_only") and not self._flushing:
+            if "replica" not in self.info:
+                self.info["replica"] = replicas.choose()
+            if self.info["replica"] is not None:
+                return self.info["replica"]
+        return engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _route_to_primary_after_write(session, flush_context):
+    session.info["read_only"] = False
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session):
+    # `client_key` diisi get_current_user dengan token client yang login
+    if session.info.pop("wrote", False) and session.info.get("client_key"):
+        recent_writers.set(session.info["client_key"], True)
+
+
 # Session factory used to create DB sessions
-SessionLocal = sessionmaker(bind=engine, autoflush=False)
+SessionLocal = sessionmaker(bind=engine, class_=RoutingSession, autoflush=False)
 # Base class for ORM models
 Base = declarative_base()
 
@@ -40,3 +288,74 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _client_key(request: Request):
+    """Return the bearer token of the request, used as read-your-writes key."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return token if scheme.lower() == "bearer" and token else None
+
+
+def read_from_replica(session: Session) -> bool:
+    """Return True if `session` has sent reads to a read replica.
+
+    Replicas may lag behind the primary, so such results must not be
+    cached for other clients.
+    """
+    return session.info.get("replica") is not None
+
+
+def get_read_db(request: Request):
+    """Yield a session that reads from a replica when one is available.
+
+    Use for read-only handlers. Falls back to the primary when no replica
+    is configured or healthy, and for clients that committed a write in
+    the last `READ_YOUR_WRITES_SECONDS`.
+
+    Yields:
+        Session: SQLAlchemy session instance
+    """
+    db = SessionLocal()
+    client_key = _client_key(request)
+    db.info["read_only"] = not (client_key and recent_writers.get(client_key))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def init_db():
+    """Create missing tables, columns and indexes (including full-text).
+
+    `create_all` only creates tables that do not exist yet, so columns and
+    indexes added to an existing model afterwards are added here
+    explicitly (`ALTER TABLE ... ADD COLUMN` and `checkfirst` index
+    creation). New columns must therefore be nullable or carry a
+    `server_default`.
+
+    Returns:
+        list[str]: Columns that were added, as `"table.column"`
+    """
+    from app.database import models  # noqa: F401 - register models on Base
+
+    Base.metadata.create_all(bind=engine)
+
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+                added.append(f"{table.name}.{column.name}")
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    from app.database.search import create_search_index
+    create_search_index(engine)
+    return added
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .db import Base
@@ -39,6 +39,9 @@ class Post(Base):
         title (str): Judul postingan
         content (str): Isi/konten postingan
         created_at (datetime): Waktu pembuatan postingan
+        updated_at (datetime): Waktu perubahan terakhir (termasuk counter komentar)
+        comment_count (int): Jumlah komentar (counter denormalisasi)
+        last_commented_at (datetime): Waktu komentar terakhir (denormalisasi)
         author_id (int): Foreign key ke User (penulis postingan)
         category_id (int): Foreign key ke Category (kategori postingan)
         author (relationship): Relasi many-to-one dengan User
@@ -51,6 +54,13 @@ class Post(Base):
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Validator ETag / Last-Modified; ikut berubah saat counter komentar berubah
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Counter dirawat oleh comment_router agar listing tidak perlu
+    # menyentuh tabel comments (perbaiki dengan app.tools.repair_counters)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_commented_at = Column(DateTime)
 
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"))
@@ -64,6 +74,16 @@ class Post(Base):
     comments = relationship("Comment", back_populates="post")
     category = relationship("Category", back_populates="posts")
 
+    __table_args__ = (
+        # Dipakai keyset pagination listing posts (terbaru dulu)
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        # Listing per kategori / per penulis sebagai index range scan
+        Index("ix_posts_category_id_created_at_id", "category_id", "created_at", "id"),
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+        # max(updated_at) untuk ETag listing tanpa full scan
+        Index("ix_posts_updated_at", "updated_at"),
+    )
+
 
 class Comment(Base):
     """
@@ -73,6 +93,7 @@ class Comment(Base):
         id (int): Primary key, ID unik komentar
         content (str): Isi/teks komentar
         created_at (datetime): Waktu pembuatan komentar
+        updated_at (datetime): Waktu perubahan terakhir
         user_id (int): Foreign key ke User (penulis komentar)
         post_id (int): Foreign key ke Post (postingan yang dikomentar)
         user (relationship): Relasi many-to-one dengan User
@@ -83,6 +104,7 @@ class Comment(Base):
     id = Column(Integer, primary_key=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user_id = Column(Integer, ForeignKey("users.id"))
     post_id = Column(Integer, ForeignKey("posts.id"))
@@ -90,6 +112,13 @@ class Comment(Base):
     user = relationship("User", back_populates="comments")
     post = relationship("Post", back_populates="comments")
 
+    __table_args__ = (
+        # Dipakai listing komentar per postingan (keyset pagination)
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+        # count/max(updated_at) per postingan untuk ETag thread komentar
+        Index("ix_comments_post_id_updated_at", "post_id", "updated_at"),
+    )
+
 
 class Category(Base):
     """
@@ -0,0 +1,72 @@
+"""Full-text search index over `posts.title` and `posts.content`.
+
+SQLite uses an FTS5 external-content table (`posts_fts`) kept in sync
+with `posts` by triggers, so every write path (API, bulk imports, manual
+SQL) updates the index without application hooks. MySQL uses a native
+FULLTEXT index. Other backends get no index and search is unavailable.
+"""
+
+from sqlalchemy import inspect, text
+
+FTS_TABLE = "posts_fts"
+MYSQL_FULLTEXT_INDEX = "ft_posts_title_content"
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, content,
+        content='posts', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+
+def create_search_index(engine):
+    """Create the full-text index for the engine's backend if missing.
+
+    On SQLite a newly created FTS table is filled from the existing posts
+    with the FTS5 `rebuild` command.
+
+    Args:
+        engine: SQLAlchemy Engine of the primary database
+    """
+    backend = engine.dialect.name
+    inspector = inspect(engine)
+
+    if backend == "sqlite":
+        if FTS_TABLE in inspector.get_table_names():
+            return
+        with engine.begin() as conn:
+            for statement in SQLITE_DDL:
+                conn.execute(text(statement))
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+    elif backend == "mysql":
+        existing = {index["name"] for index in inspector.get_indexes("posts")}
+        if MYSQL_FULLTEXT_INDEX in existing:
+            return
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"ALTER TABLE posts ADD FULLTEXT INDEX {MYSQL_FULLTEXT_INDEX} (title, content)"
+            ))
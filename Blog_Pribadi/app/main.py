@@ -6,20 +6,53 @@ files so that the single backend process can serve both the API and
 the client files during development.
 """
 
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 import os
-from app.database.db import Base, engine
-from app.database import models
+from app.core import metrics
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.security import token_cache
+from app.core.static import CachedPage, PrecompressedStaticFiles
+from app.database.db import SessionLocal, init_db
+from app.database.async_db import dispose_async_engine, get_async_db
+from app.repositories import post_repository
 from app.routers import auth_router, post_router, category_router, comment_router, user_router
+from app.services import category_service, post_service
 from fastapi.middleware.cors import CORSMiddleware
 
 
-# Ensure DB tables exist
-Base.metadata.create_all(bind=engine)
+# Ensure DB tables, columns and indexes exist
+added_columns = init_db()
+if "posts.comment_count" in added_columns:
+    # Fill the new denormalized counters from existing comments
+    with SessionLocal() as db:
+        post_repository.recount_comment_stats(db)
+if "posts.updated_at" in added_columns or "comments.updated_at" in added_columns:
+    # Rows created before the column existed get their creation time
+    with SessionLocal() as db:
+        post_repository.backfill_updated_at(db)
 
-app = FastAPI(title="ReelBlog API")
+# Categories are embedded into post responses from memory; in async mode
+# they are loaded through an AsyncSession when the application starts
+if not settings.DB_ASYNC:
+    category_service.load_categories()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load async-mode state on startup and release background resources on shutdown."""
+    if settings.DB_ASYNC:
+        async for db in get_async_db():
+            await category_service.load_categories_async(db)
+    yield
+    password_hasher.shutdown()
+    await dispose_async_engine()
+
+
+app = FastAPI(title="ReelBlog API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,7 +60,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
 )
+# brotli (bila terpasang) atau gzip untuk response API dan file statis
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+# Added last so it is outermost and times the whole stack
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
 
 # Register routers
 app.include_router(auth_router.router)
@@ -38,21 +77,47 @@ app.include_router(user_router.router_users)
 app.include_router(user_router.router_auth_users)
 
 
-# Serve static frontend files from /frontend
+# Serve static frontend files from /frontend. The production build from
+# `python -m app.tools.build_static` (frontend/dist) is preferred when it
+# exists; anything not in the build falls back to the source files.
 frontend_path = os.path.join(os.path.dirname(__file__), '..', 'frontend')
+dist_path = os.path.join(frontend_path, 'dist')
+static_path = dist_path if os.path.isdir(dist_path) else frontend_path
 if os.path.exists(frontend_path):
-    app.mount("/frontend", StaticFiles(directory=frontend_path), name="frontend")
+    app.mount(
+        "/frontend",
+        PrecompressedStaticFiles(
+            directory=static_path,
+            fallback=frontend_path if static_path != frontend_path else None
+        ),
+        name="frontend"
+    )
+
+# index.html is read once and served from memory
+index_path = os.path.join(static_path, "index.html")
+index_page = CachedPage(index_path) if os.path.exists(index_path) else None
 
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the frontend index.html as the root route.
 
-    If `frontend/index.html` exists it is returned as a FileResponse. This
-    simplifies development because a single process serves both API and
-    static client files.
+    If `frontend/index.html` exists it is served from memory (compressed
+    when the client supports it, 304 on a matching ETag). This simplifies
+    development because a single process serves both API and static
+    client files.
     """
-    index_path = os.path.join(frontend_path, "index.html")
-    if os.path.exists(index_path):
-        return FileResponse(index_path)
-    return {"message": "Welcome to Blog API"}
\ No newline at end of file
+    if index_page is not None:
+        return index_page.response(request)
+    return {"message": "Welcome to Blog API"}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        """Expose per-route latency, query and cache metrics for Prometheus."""
+        caches = dict(post_service.cache_stats(), token=token_cache.stats())
+        return PlainTextResponse(
+            metrics.render(caches=caches),
+            media_type="text/plain; version=0.0.4"
+        )
@@ -0,0 +1,23 @@
+"""Async repository helpers for `Category` model.
+
+Async counterparts of `category_repository` for use with an
+`AsyncSession` (see `app.database.async_db`).
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.models import Category
+
+
+async def create_category(db: AsyncSession, category: Category):
+    """Persist a new Category and return the created instance."""
+    db.add(category)
+    await db.commit()
+    await db.refresh(category)
+    return category
+
+
+async def get_categories(db: AsyncSession):
+    """Return all Category records."""
+    result = await db.execute(select(Category))
+    return result.scalars().all()
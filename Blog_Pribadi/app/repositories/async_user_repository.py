@@ -0,0 +1,56 @@
+"""Async repository helpers for `User` model.
+
+Async counterparts of `user_repository` for use with an `AsyncSession`
+(see `app.database.async_db`).
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.models import User
+
+
+async def get_user_by_username(db: AsyncSession, username: str):
+    """Return a User by `username` or None if not found.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session
+        username (str): Username to look up
+
+    Returns:
+        User | None
+    """
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
+
+async def create_user(db: AsyncSession, user: User):
+    """Persist a new `User` to the database.
+
+    Commits the transaction and refreshes the instance so the caller
+    receives populated fields (e.g. `id`).
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session
+        user (User): User instance to persist
+
+    Returns:
+        User: Persisted user instance with generated fields filled
+    """
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+async def get_usernames(db: AsyncSession, user_ids):
+    """Return `(id, username)` rows for the given user ids.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session
+        user_ids (Iterable[int]): Primary keys to look up
+
+    Returns:
+        list[Row]: One row per existing user (missing ids are skipped)
+    """
+    result = await db.execute(select(User.id, User.username).where(User.id.in_(list(user_ids))))
+    return result.all()
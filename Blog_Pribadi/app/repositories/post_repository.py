@@ -5,8 +5,9 @@ Provides small, focused functions to create, read, update and delete
 centralized and reusable.
 """
 
+from sqlalchemy import case, func, or_, select
 from sqlalchemy.orm import Session
-from app.database.models import Post
+from app.database.models import Comment, Post
 
 
 def create_post(db: Session, post: Post):
@@ -60,4 +61,96 @@ def update_post(db: Session, post: Post, title: str, content: str):
     post.content = content
     db.commit()
     db.refresh(post)
-    return post
\ No newline at end of file
+    return post
+
+
+def increment_comment_count(db: Session, post_id: int, commented_at):
+    """Increase the comment counter of a Post after a comment is added.
+
+    Does not commit: the caller commits together with the new comment so
+    the counter and the comments table change in one transaction.
+    """
+    db.query(Post).filter(Post.id == post_id).update(
+        {
+            Post.comment_count: Post.comment_count + 1,
+            Post.last_commented_at: commented_at,
+        },
+        synchronize_session=False,
+    )
+
+
+def decrement_comment_count(db: Session, post_id: int):
+    """Decrease the comment counter of a Post after a comment is deleted.
+
+    `last_commented_at` is recomputed from the remaining comments. Must be
+    called after the deleted comment has been flushed; does not commit.
+    """
+    last_commented_at = (
+        select(func.max(Comment.created_at))
+        .where(Comment.post_id == post_id)
+        .scalar_subquery()
+    )
+    db.query(Post).filter(Post.id == post_id).update(
+        {
+            Post.comment_count: case(
+                (Post.comment_count > 0, Post.comment_count - 1), else_=0
+            ),
+            Post.last_commented_at: last_commented_at,
+        },
+        synchronize_session=False,
+    )
+
+
+def recount_comment_stats(db: Session):
+    """Recompute `comment_count` and `last_commented_at` for every Post.
+
+    Repairs drifted counters with a single bulk UPDATE using correlated
+    subqueries over the comments table, then commits. Only posts whose
+    counters actually differ are written, so `updated_at` (and with it the
+    HTTP validators) of correct rows is left alone.
+
+    Returns:
+        int: Number of Post rows updated
+    """
+    comment_count = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id)
+        .scalar_subquery()
+    )
+    last_commented_at = (
+        select(func.max(Comment.created_at))
+        .where(Comment.post_id == Post.id)
+        .scalar_subquery()
+    )
+    updated = db.query(Post).filter(
+        or_(
+            Post.comment_count != comment_count,
+            Post.last_commented_at.is_distinct_from(last_commented_at),
+        )
+    ).update(
+        {
+            Post.comment_count: comment_count,
+            Post.last_commented_at: last_commented_at,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return updated
+
+def backfill_updated_at(db: Session):
+    """Set `updated_at = created_at` on posts and comments that have none.
+
+    Used once after the `updated_at` columns are added to an existing
+    database, then commits.
+
+    Returns:
+        int: Number of rows updated
+    """
+    updated = 0
+    for model in (Post, Comment):
+        updated += db.query(model).filter(model.updated_at.is_(None)).update(
+            {model.updated_at: model.created_at},
+            synchronize_session=False,
+        )
+    db.commit()
+    return updated
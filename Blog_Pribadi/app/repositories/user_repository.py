@@ -40,3 +40,16 @@ def create_user(db: Session, user: User):
     db.commit()
     db.refresh(user)
     return user
+
+
+def get_usernames(db: Session, user_ids):
+    """Return `(id, username)` rows for the given user ids.
+
+    Args:
+        db (Session): SQLAlchemy session
+        user_ids (Iterable[int]): Primary keys to look up
+
+    Returns:
+        list[Row]: One row per existing user (missing ids are skipped)
+    """
+    return db.query(User.id, User.username).filter(User.id.in_(list(user_ids))).all()
@@ -1,33 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 
 from app.database.db import get_db
-from app.database.models import User
+from app.database.async_db import AsyncSessionRoute
 from app.schema.user_schema import UserRegister, UserLogin
-from app.services.auth_service import login_user
-from app.core.security import get_current_user
+from app.services.auth_service import authenticate_user, register_user
+from app.core.metrics import query_budget
+from app.core.security import get_current_user, create_access_token
 
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
-
-def hash_password(password: str):
-    """Hash password menggunakan pbkdf2_sha256 algorithm.
-    
-    Args:
-        password (str): Password plain text
-        
-    Returns:
-        str: Password yang sudah di-hash
-    """
-    return pwd_context.hash(password)
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=AsyncSessionRoute)
 
 
-@router.post("/register")
-def register(data: UserRegister, db: Session = Depends(get_db)):
+@router.post("/register", dependencies=[Depends(query_budget(3))])
+async def register(data: UserRegister, db: Session = Depends(get_db)):
     """Register user baru.
     
+    Hashing password dijalankan di process pool hashing; query database
+    dijalankan secara async atau di threadpool.
+    
     Args:
         data (UserRegister): Username dan password user baru
         db (Session): Database session
@@ -36,7 +27,8 @@ def register(data: UserRegister, db: Session = Depends(get_db)):
         dict: ID, username, dan message sukses
         
     Raises:
-        HTTPException: 400 jika password > 72 karakter atau username sudah ada
+        HTTPException: 400 jika password > 72 karakter atau username sudah ada,
+            429 jika antrean hashing penuh
     """
     if len(data.password.encode("utf-8")) > 72:
         raise HTTPException(
@@ -44,17 +36,10 @@ def register(data: UserRegister, db: Session = Depends(get_db)):
             detail="Password maksimal 72 karakter"
         )
 
-    if db.query(User).filter(User.username == data.username).first():
+    user = await register_user(db, data.username, data.password)
+    if not user:
         raise HTTPException(status_code=400, detail="Username sudah digunakan")
 
-    user = User(
-        username=data.username,
-        password=hash_password(data.password)
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
     return {
         "id": user.id,
         "username": user.username,
@@ -62,8 +47,8 @@ def register(data: UserRegister, db: Session = Depends(get_db)):
     }
 
 
-@router.post("/login")
-def login(data: UserLogin, db: Session = Depends(get_db)):
+@router.post("/login", dependencies=[Depends(query_budget(1))])
+async def login(data: UserLogin, db: Session = Depends(get_db)):
     """Login dengan username dan password.
     
     Args:
@@ -74,20 +59,15 @@ def login(data: UserLogin, db: Session = Depends(get_db)):
         dict: Access token, token type, user ID, dan username
         
     Raises:
-        HTTPException: 401 jika username atau password salah
+        HTTPException: 401 jika username atau password salah,
+            429 jika antrean hashing penuh
     """
-    user = db.query(User).filter(User.username == data.username).first()
-    
-    if not user:
-        raise HTTPException(status_code=401, detail="Username atau password salah")
-    
     # Verify password menggunakan auth_service
-    from app.core.security import verify_password
-    if not verify_password(data.password, user.password):
+    user = await authenticate_user(db, data.username, data.password)
+    if not user:
         raise HTTPException(status_code=401, detail="Username atau password salah")
     
     # Create token
-    from app.core.security import create_access_token
     token = create_access_token({"user_id": user.id})
     
     
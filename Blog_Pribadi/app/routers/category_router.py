@@ -1,27 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from typing import List, Optional
 
-from app.database.db import get_db
-from app.database.models import Category
-from app.schema.category_schema import CategoryCreate
+from app.database.db import get_db, get_read_db
+from app.database.async_db import AsyncSessionRoute
+from app.schema.category_schema import CategoryCreate, CategoryResponse
+from app.schema.post_schema import PostPage
+from app.core.metrics import query_budget
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services import category_service, post_service
 
 router = APIRouter(
     prefix="/categories",
-    tags=["Categories"]
+    tags=["Categories"],
+    route_class=AsyncSessionRoute
 )
 
-@router.get("/")
-def get_all_categories(db: Session = Depends(get_db)):
+@router.get(
+    "/",
+    response_model=List[CategoryResponse],
+    dependencies=[Depends(query_budget(1))]
+)
+def get_all_categories(db: Session = Depends(get_read_db)):
     """
-    Get semua kategori
+    Get semua kategori (dari peta kategori in-memory, tanpa query)
     
+    Args:
+        db: Database session, hanya dipakai saat peta kedaluwarsa
+        
     Returns:
-        List[Category]: Daftar semua kategori
+        List[CategoryResponse]: Daftar semua kategori
     """
-    categories = db.query(Category).all()
-    return categories
+    return category_service.get_all_categories(db)
 
-@router.post("/")
+@router.post(
+    "/",
+    response_model=CategoryResponse,
+    dependencies=[Depends(query_budget(3))]
+)
 def create_category(
     data: CategoryCreate,
     db: Session = Depends(get_db)
@@ -35,4 +51,40 @@ def create_category(
         
     Returns:
         Category: Kategori yang baru dibuat
+        
+    Raises:
+        HTTPException: 400 jika nama kategori sudah digunakan
+    """
+    return category_service.create_category(db, data)
+
+@router.get(
+    "/{category_id}/posts",
+    response_model=PostPage,
+    dependencies=[Depends(query_budget(2))]
+)
+def get_posts_by_category(
+    category_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get postingan pada satu kategori per halaman (terbaru dulu)
+    
+    Args:
+        category_id: ID kategori
+        limit: Jumlah postingan per halaman
+        cursor: `next_cursor` dari halaman sebelumnya
+        db: Database session
+        
+    Returns:
+        PostPage: Postingan pada halaman ini dan cursor halaman berikutnya
+        
+    Raises:
+        HTTPException: 404 jika kategori tidak ditemukan
     """
+    page = post_service.get_posts(db, limit=limit, cursor=cursor, category_id=category_id)
+    # Cek keberadaan kategori hanya jika halaman kosong
+    if not page.items and category_service.get_category(category_id) is None:
+        raise HTTPException(status_code=404, detail="Kategori tidak ditemukan")
+    return page
@@ -1,19 +1,141 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.database.db import get_db
-from app.database.models import Comment, Post, User
-from app.schema.comment_schema import CommentCreate, CommentResponse
+from app.database.db import get_db, get_read_db
+from app.database.async_db import AsyncSessionRoute
+from app.database.models import Comment, Post
+from app.schema.comment_schema import CommentCreate, CommentResponse, CommentPage
 from app.core.security import get_current_user
-from typing import List
+from app.core import conditional, fast_json
+from app.core.metrics import query_budget
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_filter, next_cursor
+from app.repositories import post_repository
+from app.services import post_service, user_service
+from typing import Dict, List, Optional
 
 router = APIRouter(
     prefix="/comments",
-    tags=["Comments"]
+    tags=["Comments"],
+    route_class=AsyncSessionRoute
 )
 
+MAX_BATCH_POSTS = 100
+MAX_COMMENTS_PER_POST = 50
 
-@router.post("/posts/{post_id}", response_model=CommentResponse)
+
+def _parse_post_ids(post_ids: str):
+    """Mengubah string `1,2,3` menjadi list ID postingan unik.
+    
+    Raises:
+        HTTPException: 400 jika format tidak valid atau jumlah ID melebihi batas
+    """
+    try:
+        ids = list(dict.fromkeys(int(part) for part in post_ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="post_ids harus berupa daftar angka dipisah koma")
+
+    if not ids:
+        raise HTTPException(status_code=400, detail="post_ids tidak boleh kosong")
+    if len(ids) > MAX_BATCH_POSTS:
+        raise HTTPException(status_code=400, detail=f"Maksimal {MAX_BATCH_POSTS} post_ids per request")
+    return ids
+
+
+def _thread_validators(db: Session, post_id: int, *variant):
+    """Menghitung ETag thread komentar satu postingan.
+    
+    Satu query agregat di atas index `(post_id, updated_at)`; keberadaan
+    postingan ikut dicek agar thread postingan yang dihapus tidak dijawab 304.
+    Thread tidak punya Last-Modified karena `max(updated_at)` tidak berubah
+    saat komentar dihapus.
+    
+    Returns:
+        tuple: (ETag, None) atau None jika postingan tidak ditemukan
+    """
+    post_exists = db.query(Post.id).filter(Post.id == post_id).scalar_subquery()
+    exists, count, last_modified = db.query(
+        post_exists,
+        func.count(Comment.id),
+        func.max(Comment.updated_at)
+    ).filter(
+        Comment.post_id == post_id
+    ).one()
+    if exists is None:
+        return None
+    return conditional.make_etag("comments", post_id, count, last_modified, *variant), None
+
+
+@router.get(
+    "/",
+    response_model=Dict[int, List[CommentResponse]],
+    dependencies=[Depends(query_budget(2))]
+)
+def get_comments_for_posts(
+    post_ids: str,
+    per_post: int = Query(5, ge=1, le=MAX_COMMENTS_PER_POST),
+    db: Session = Depends(get_read_db)
+):
+    """Menampilkan komentar terbaru untuk banyak postingan sekaligus.
+    
+    Dipakai feed agar tidak perlu satu request per postingan. Komentar
+    terbaru per postingan dipilih dengan satu query window function
+    `ROW_NUMBER() OVER (PARTITION BY post_id ...)`.
+    
+    Args:
+        post_ids (str): Daftar ID postingan dipisah koma, contoh `1,2,3`
+        per_post (int): Jumlah maksimal komentar per postingan
+        db (Session): Database session
+        
+    Returns:
+        Dict[int, List[CommentResponse]]: Komentar per ID postingan, diurutkan
+            terlama dulu; postingan tanpa komentar berisi list kosong
+        
+    Raises:
+        HTTPException: 400 jika post_ids tidak valid
+    """
+    ids = _parse_post_ids(post_ids)
+
+    ranked = db.query(
+        Comment.id.label("id"),
+        func.row_number().over(
+            partition_by=Comment.post_id,
+            order_by=(Comment.created_at.desc(), Comment.id.desc())
+        ).label("rank")
+    ).filter(
+        Comment.post_id.in_(ids)
+    ).subquery()
+
+    comments = db.query(
+        Comment
+    ).join(
+        ranked, ranked.c.id == Comment.id
+    ).filter(
+        ranked.c.rank <= per_post
+    ).order_by(
+        Comment.post_id, Comment.created_at, Comment.id
+    ).all()
+    usernames = user_service.get_usernames(db, (comment.user_id for comment in comments))
+
+    result = {post_id: [] for post_id in ids}
+    for comment in comments:
+        result[comment.post_id].append(CommentResponse(
+            id=comment.id,
+            content=comment.content,
+            user_id=comment.user_id,
+            username=usernames.get(comment.user_id, user_service.UNKNOWN_USERNAME),
+            post_id=comment.post_id,
+            created_at=comment.created_at
+        ))
+
+    return result
+
+
+@router.post(
+    "/posts/{post_id}",
+    response_model=CommentResponse,
+    dependencies=[Depends(query_budget(5))]
+)
 def add_comment(
     post_id: int,
     data: CommentCreate,
@@ -48,7 +170,11 @@ def add_comment(
     )
 
     db.add(comment)
+    db.flush()
+    # Counter diperbarui dalam transaksi yang sama dengan komentar baru
+    post_repository.increment_comment_count(db, post_id, comment.created_at)
     db.commit()
+    post_service.invalidate_post_cache(post_id)
     db.refresh(comment)
     
     return CommentResponse(
@@ -60,43 +186,85 @@ def add_comment(
         created_at=comment.created_at
     )
 
-@router.get("/posts/{post_id}", response_model=List[CommentResponse])
+@router.get(
+    "/posts/{post_id}",
+    response_model=CommentPage,
+    dependencies=[Depends(query_budget(3))]
+)
 def get_comments_by_post(
     post_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Menampilkan seluruh komentar pada satu postingan blog.
+    """Menampilkan komentar pada satu postingan blog per halaman (terlama dulu).
+    
+    Username komentator diambil dari cache `user_service` (satu query
+    `IN` untuk yang belum ter-cache), sehingga jumlah query tetap
+    konstan berapa pun jumlah komentar.
+    Request dengan `If-None-Match` yang masih cocok dijawab 304 tanpa
+    mengambil komentar (thread hanya punya ETag, lihat `_thread_validators`).
     
     Args:
         post_id (int): ID postingan
+        request (Request): Request dari client (header kondisional)
+        response (Response): Response untuk header validator
+        limit (int): Jumlah komentar per halaman
+        cursor (Optional[str]): `next_cursor` dari halaman sebelumnya
         db (Session): Database session
         
     Returns:
-        List[CommentResponse]: Daftar semua komentar dengan info komentator
+        CommentPage: Komentar dengan info komentator dan cursor halaman
+        berikutnya (atau 304 Not Modified)
         
     Raises:
         HTTPException: 404 jika postingan tidak ditemukan
     """
-
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
+    validators = _thread_validators(db, post_id, limit, cursor)
+    if validators is None:
         raise HTTPException(status_code=404, detail="Post tidak ditemukan")
+    etag, last_modified = validators
+    if conditional.is_not_modified(request, etag, last_modified):
+        return conditional.not_modified(etag, last_modified)
+    conditional.set_validators(response, etag, last_modified)
 
-    comments = db.query(Comment).filter(Comment.post_id == post_id).all()
-    
-    result = []
-    for comment in comments:
-        user = db.query(User).filter(User.id == comment.user_id).first()
-        result.append(CommentResponse(
-            id=comment.id,
-            content=comment.content,
-            user_id=comment.user_id,
-            username=user.username if user else "Unknown",
-            post_id=comment.post_id,
-            created_at=comment.created_at
-        ))
+    query = db.query(Comment).filter(Comment.post_id == post_id)
+    if cursor:
+        query = query.filter(
+            keyset_filter(Comment.created_at, Comment.id, cursor, descending=False)
+        )
+
+    comments = query.order_by(
+        Comment.created_at, Comment.id
+    ).limit(limit + 1).all()
+
+    cursor_next = next_cursor(comments, limit, lambda comment: (comment.created_at, comment.id))
+    comments = comments[:limit]
+    usernames = user_service.get_usernames(db, (comment.user_id for comment in comments))
+    result = [
+        {
+            "id": comment.id,
+            "content": comment.content,
+            "user_id": comment.user_id,
+            "username": usernames.get(comment.user_id, user_service.UNKNOWN_USERNAME),
+            "post_id": comment.post_id,
+            "created_at": comment.created_at
+        }
+        for comment in comments
+    ]
+
+    if fast_json.enabled():
+        return conditional.set_validators(
+            fast_json.FastJSONResponse({"items": result, "next_cursor": cursor_next}),
+            etag, last_modified
+        )
     
-    return result
+    return CommentPage(
+        items=[CommentResponse(**data) for data in result],
+        next_cursor=cursor_next
+    )
 
 
 @router.put("/{comment_id}", response_model=CommentResponse)
@@ -168,6 +336,10 @@ def delete_comment(
         raise HTTPException(status_code=403, detail="Anda tidak memiliki akses untuk menghapus komentar ini")
 
     db.delete(comment)
+    db.flush()
+    if comment.post_id is not None:
+        post_repository.decrement_comment_count(db, comment.post_id)
     db.commit()
+    post_service.invalidate_post_cache(comment.post_id)
 
     return {"message": "Komentar berhasil dihapus"}
\ No newline at end of file
@@ -1,28 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from sqlalchemy.orm import joinedload
+from typing import List, Literal, Optional, Union
 
-from app.database.db import get_db
-from app.database.models import User, Post
-from app.schema.post_schema import PostCreate, PostUpdate, PostResponse
+from app.database.db import get_db, get_read_db
+from app.database.async_db import AsyncSessionRoute
+from app.database.models import Post
+from app.schema.user_schema import UserResponse
+from app.schema.post_schema import (
+    PostCreate, PostBatchCreate, PostUpdate, PostResponse, PostPage, PostSummaryPage,
+    PostSearchPage
+)
 from app.core.security import get_current_user
-from app.services import post_service
+from app.core import conditional, fast_json
+from app.core.metrics import query_budget
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services import post_service, search_service
 
-router = APIRouter(prefix="/posts", tags=["Posts"])
+router = APIRouter(prefix="/posts", tags=["Posts"], route_class=AsyncSessionRoute)
 
-@router.post("/", response_model=PostResponse)
+@router.post(
+    "/",
+    response_model=PostResponse,
+    dependencies=[Depends(query_budget(3))]
+)
 def create_post(
     data: PostCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserResponse = Depends(get_current_user)
 ):
     """Membuat postingan blog baru.
     
     Args:
         data (PostCreate): Judul, konten, dan kategori postingan
         db (Session): Database session
-        current_user (User): User yang sedang login
+        current_user (UserResponse): Principal user yang sedang login
         
     Returns:
         PostResponse: Data postingan yang baru dibuat beserta username penulis
@@ -30,22 +43,39 @@ def create_post(
     # PAKAI SERVICE
     post = post_service.create_post(db, data, current_user.id)
     
-    # AMBIL POST DENGAN USER DATA MENGGUNAKAN JOINLOAD
-    post_with_author = db.query(Post).options(
-        joinedload(Post.author)
-    ).filter(Post.id == post.id).first()
-    
-    return PostResponse(
-        id=post.id,
-        title=post.title,
-        content=post.content,
-        created_at=post.created_at,
-        author_id=post.author_id,
-        username=post_with_author.author.username,
-        category_id=post.category_id
-    )
+    # Username penulis sudah ada pada current_user, tidak perlu query ulang
+    return post_service.build_post_response(post, current_user.username)
+
+@router.post(
+    "/batch",
+    response_model=List[PostResponse],
+    dependencies=[Depends(query_budget(4))]
+)
+def create_posts_batch(
+    data: PostBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Membuat banyak postingan sekaligus dalam satu transaksi.
+    
+    Dipakai tool penjadwalan publikasi; jika satu postingan gagal
+    divalidasi, tidak ada postingan yang dibuat.
+    
+    Args:
+        data (PostBatchCreate): Daftar postingan (maksimal `MAX_BATCH_POSTS`)
+        db (Session): Database session
+        current_user (UserResponse): Principal user yang sedang login
+        
+    Returns:
+        List[PostResponse]: Postingan yang dibuat, sesuai urutan input
+        
+    Raises:
+        HTTPException: 400 jika jumlah postingan di luar batas atau ada
+            kategori yang tidak ditemukan
+    """
+    return post_service.create_posts(db, data.items, current_user.id, current_user.username)
 
-@router.delete("/{post_id}")
+@router.delete("/{post_id}", dependencies=[Depends(query_budget(5))])
 def delete_post(
     post_id: int,
     db: Session = Depends(get_db),
@@ -73,41 +103,175 @@ def delete_post(
 
     db.delete(post)
     db.commit()
+    post_service.invalidate_post_cache(post_id)
     return {"message": "Post berhasil dihapus"}
 
-@router.get("/", response_model=List[PostResponse])
-def get_posts(db: Session = Depends(get_db)):
-    """Menampilkan daftar seluruh posting blog.
+@router.get(
+    "/",
+    response_model=Union[PostPage, PostSummaryPage],
+    response_model_exclude_unset=True,
+    dependencies=[Depends(query_budget(3))]
+)
+def get_posts(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    fields: Optional[str] = Query(None, max_length=300),
+    excerpt_length: int = Query(
+        post_service.DEFAULT_EXCERPT_LENGTH, ge=1, le=post_service.MAX_EXCERPT_LENGTH
+    ),
+    db: Session = Depends(get_read_db)
+):
+    """Menampilkan daftar posting blog per halaman (terbaru dulu).
+    
+    `view=summary` mengganti konten penuh dengan `excerpt` sepanjang
+    `excerpt_length` karakter; `fields=id,title,...` hanya mengirim field
+    yang disebut (`id` selalu ikut). Keduanya hanya membaca kolom yang
+    diperlukan dari database.
+    
+    Response membawa `ETag` (tanpa `Last-Modified`, yang tidak berubah
+    saat postingan dihapus); request dengan `If-None-Match` yang masih
+    cocok dijawab 304 tanpa merender halaman. Halaman dari cache hanya dipakai bila dibuat
+    untuk ETag yang sama, sehingga body selalu sesuai dengan ETag-nya.
     
     Args:
+        request (Request): Request dari client (header kondisional)
+        response (Response): Response untuk header validator
+        limit (int): Jumlah postingan per halaman
+        cursor (Optional[str]): `next_cursor` dari halaman sebelumnya
+        view (str): `full` (default) atau `summary`
+        fields (Optional[str]): Daftar field dipisah koma, mengabaikan `view`
+        excerpt_length (int): Panjang excerpt untuk `summary`/`fields=excerpt`
         db (Session): Database session
         
     Returns:
-        List[PostResponse]: Daftar semua postingan dengan info penulis
+        PostPage | PostSummaryPage: Postingan pada halaman ini dan cursor
+        halaman berikutnya (atau 304 Not Modified)
+        
+    Raises:
+        HTTPException: 400 jika `fields` berisi field yang tidak dikenal
     """
+    selected = post_service.parse_fields(fields) if fields else None
+    etag, last_modified = post_service.get_listing_validators(
+        db, limit, cursor, selected or view, excerpt_length
+    )
+    if conditional.is_not_modified(request, etag, last_modified):
+        return conditional.not_modified(etag, last_modified)
+    conditional.set_validators(response, etag, last_modified)
+
+    if selected:
+        return post_service.get_post_summaries(
+            db, selected, limit=limit, cursor=cursor, excerpt_length=excerpt_length, version=etag
+        )
+    if view == "summary":
+        return post_service.get_post_summaries(
+            db, limit=limit, cursor=cursor, excerpt_length=excerpt_length, version=etag
+        )
+    if fast_json.enabled():
+        body = post_service.get_posts_json(db, limit=limit, cursor=cursor, version=etag)
+        return conditional.set_validators(fast_json.FastJSONResponse(body), etag, last_modified)
     # PAKAI SERVICE YANG SUDAH DIPERBAIKI
-    return post_service.get_posts(db)
+    return post_service.get_posts(db, limit=limit, cursor=cursor, version=etag)
+
+@router.get("/search", response_model=PostSearchPage)
+def search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db)
+):
+    """Mencari posting blog berdasarkan judul dan konten.
+    
+    Hasil diurutkan berdasarkan relevansi (BM25) dengan highlight judul
+    dan snippet konten.
+    
+    Args:
+        q (str): Kata kunci pencarian
+        limit (int): Jumlah hasil per halaman
+        offset (int): `next_offset` dari halaman sebelumnya
+        db (Session): Database session
+        
+    Returns:
+        PostSearchPage: Hasil pencarian dan offset halaman berikutnya
+    """
+    return search_service.search_posts(db, q, limit=limit, offset=offset)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+@router.get("/export", response_class=StreamingResponse)
+def export_posts(format: Literal["ndjson", "csv"] = "ndjson"):
+    """Mengunduh seluruh arsip postingan sebagai NDJSON atau CSV.
+    
+    Output di-stream row demi row dari server-side cursor, sehingga
+    memori server tetap datar berapa pun jumlah postingan.
+    
+    Args:
+        format (str): `ndjson` (default, satu objek JSON per baris) atau `csv`
+        
+    Returns:
+        StreamingResponse: File export sebagai attachment
+    """
+    filename = f"posts-{datetime.utcnow():%Y%m%d}.{format}"
+    return StreamingResponse(
+        post_service.iter_post_export(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
-@router.get("/{post_id}", response_model=PostResponse)
-def get_post(post_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/{post_id}",
+    response_model=PostResponse,
+    dependencies=[Depends(query_budget(3))]
+)
+def get_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db)
+):
     """Menampilkan detail satu posting berdasarkan ID.
     
+    Mendukung `If-None-Match` / `If-Modified-Since` (304) berdasarkan
+    `updated_at` postingan.
+    
     Args:
         post_id (int): ID postingan
+        request (Request): Request dari client (header kondisional)
+        response (Response): Response untuk header validator
         db (Session): Database session
         
     Returns:
-        PostResponse: Data postingan dengan info penulis
+        PostResponse: Data postingan dengan info penulis (atau 304 Not Modified)
         
     Raises:
         HTTPException: 404 jika postingan tidak ditemukan
     """
-    post = post_service.get_post_detail(db, post_id)
+    validators = post_service.get_post_validators(db, post_id)
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Post tidak ditemukan")
+    etag, last_modified = validators
+    if conditional.is_not_modified(request, etag, last_modified):
+        return conditional.not_modified(etag, last_modified)
+    conditional.set_validators(response, etag, last_modified)
+
+    if fast_json.enabled():
+        body = post_service.get_post_detail_json(db, post_id, version=etag)
+        if body is None:
+            raise HTTPException(status_code=404, detail="Post tidak ditemukan")
+        return conditional.set_validators(fast_json.FastJSONResponse(body), etag, last_modified)
+
+    post = post_service.get_post_detail(db, post_id, version=etag)
     if not post:
         raise HTTPException(status_code=404, detail="Post tidak ditemukan")
     return post
 
-@router.put("/{post_id}", response_model=PostResponse)
+@router.put(
+    "/{post_id}",
+    response_model=PostResponse,
+    dependencies=[Depends(query_budget(4))]
+)
 def update_post(
     post_id: int,
     data: PostUpdate,
@@ -141,19 +305,8 @@ def update_post(
         post.category_id = data.category_id
     
     db.commit()
+    post_service.invalidate_post_cache(post_id)
     db.refresh(post)
     
-    # AMBIL LAGI DENGAN USER DATA
-    post_with_author = db.query(Post).options(
-        joinedload(Post.author)
-    ).filter(Post.id == post.id).first()
-    
-    return PostResponse(
-        id=post.id,
-        title=post.title,
-        content=post.content,
-        created_at=post.created_at,
-        author_id=post.author_id,
-        username=post_with_author.author.username,
-        category_id=post.category_id
-    )
\ No newline at end of file
+    # Hanya pemilik yang bisa mengedit, jadi penulisnya adalah current_user
+    return post_service.build_post_response(post, current_user.username)
\ No newline at end of file
@@ -1,21 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
-from app.database.db import get_db
+from app.database.db import get_read_db
+from app.database.async_db import AsyncSessionRoute
 from app.database.models import User
-from app.schema.user_schema import UserResponse
+from app.schema.user_schema import UserPage, UserResponse
+from app.schema.post_schema import PostPage
+from app.core.metrics import query_budget
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services import post_service, user_service
 
 
 """Lightweight user endpoints used by the frontend.
 
 This router provides simple read-only endpoints for listing users and
-fetching a user by id. The endpoints are exposed both as `/users` and
+fetching a user by id. `GET /users/` is a paginated directory ordered
+by username (with prefix search) and `GET /users/?ids=1,2,3` resolves
+many users in one request from the shared id -> username cache. The
+endpoints are exposed both as `/users` and
 as `/auth/users` to maintain compatibility with older frontend paths.
 """
 
-router_users = APIRouter(prefix="/users", tags=["Users"])
-router_auth_users = APIRouter(prefix="/auth/users", tags=["Users"])
+router_users = APIRouter(prefix="/users", tags=["Users"], route_class=AsyncSessionRoute)
+router_auth_users = APIRouter(prefix="/auth/users", tags=["Users"], route_class=AsyncSessionRoute)
+
+# Maximum number of ids accepted by `GET /users/?ids=`
+MAX_USER_IDS = 100
+
+
+def _parse_user_ids(ids: str):
+    """Parse `1,2,3` into a list of unique user ids, keeping their order.
+
+    Raises:
+        HTTPException: 400 if the list is malformed, empty or too long
+    """
+    try:
+        user_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma separated list of numbers")
+
+    if not user_ids:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(user_ids) > MAX_USER_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_USER_IDS} ids per request")
+    return user_ids
 
 
 def _serialize_user(user: User):
@@ -30,44 +59,129 @@ def _serialize_user(user: User):
     return {"id": user.id, "username": user.username}
 
 
-@router_users.get("/", response_model=List[UserResponse])
-def list_users(db: Session = Depends(get_db)):
-    """Return all users in the system.
+@router_users.get(
+    "/",
+    response_model=Union[UserPage, List[UserResponse]],
+    dependencies=[Depends(query_budget(1))]
+)
+def list_users(
+    ids: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    prefix: Optional[str] = Query(None, min_length=1, max_length=50),
+    db: Session = Depends(get_read_db)
+):
+    """Return one page of the user directory, or the users listed in `ids`.
+
+    The directory is ordered by username and paginated with a keyset
+    cursor on the unique `users.username` index, so each call costs
+    O(limit) however many users exist. `prefix` narrows it to usernames
+    starting with the given text (case-sensitive on SQLite).
+
+    With `ids` the usernames come from the shared id -> username cache
+    and at most one query fetches the ids that are not cached yet, so a
+    client can resolve every author on a page in one request. `ids`
+    cannot be combined with the directory parameters, since the two
+    modes return different shapes.
 
     Args:
+        ids (Optional[str]): Comma separated user ids, e.g. `1,2,3`
+        limit (Optional[int]): Users per page (default `DEFAULT_PAGE_SIZE`,
+            at most `MAX_PAGE_SIZE`)
+        cursor (Optional[str]): `next_cursor` from the previous page
+        prefix (Optional[str]): Only usernames starting with this text
         db (Session): Database session
 
     Returns:
-        List[UserResponse]: All users as Pydantic response models
-    """
-    users = db.query(User).all()
-    return [UserResponse(id=u.id, username=u.username) for u in users]
+        UserPage | List[UserResponse]: One directory page, or with `ids`
+            the requested users in the order given (unknown ids are skipped)
 
+    Raises:
+        HTTPException: 400 if `ids` is malformed or too long or combined
+            with `limit`, `cursor` or `prefix`, or the cursor is invalid
+    """
+    if ids is not None:
+        if limit is not None or cursor is not None or prefix is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="ids cannot be combined with limit, cursor or prefix"
+            )
+        user_ids = _parse_user_ids(ids)
+        usernames = user_service.get_usernames(db, user_ids)
+        return [
+            UserResponse(id=user_id, username=usernames[user_id])
+            for user_id in user_ids if user_id in usernames
+        ]
+
+    return user_service.get_user_directory(
+        db, limit=limit or DEFAULT_PAGE_SIZE, cursor=cursor, prefix=prefix
+    )
+
+
+@router_users.get(
+    "/{user_id}",
+    response_model=UserResponse,
+    dependencies=[Depends(query_budget(1))]
+)
+def get_user(user_id: int, db: Session = Depends(get_read_db)):
+    """Return a single user by id (from the id -> username cache).
 
-@router_users.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    """Return a single user by id.
+    Raises HTTP 404 if the user does not exist.
+    """
+    username = user_service.get_username(db, user_id)
+    if username is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return UserResponse(id=user_id, username=username)
+
+
+@router_users.get(
+    "/{user_id}/posts",
+    response_model=PostPage,
+    dependencies=[Depends(query_budget(3))]
+)
+def get_user_posts(
+    user_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Return one page of posts written by a user, newest first.
 
     Raises HTTP 404 if the user does not exist.
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    page = post_service.get_posts(db, limit=limit, cursor=cursor, author_id=user_id)
+    # Only check that the user exists when the page is empty
+    if not page.items and user_service.get_username(db, user_id) is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserResponse(id=user.id, username=user.username)
+    return page
 
 
 # Mirror the same endpoints under /auth/users for compatibility with frontend
-@router_auth_users.get("/", response_model=List[UserResponse])
-def list_users_auth(db: Session = Depends(get_db)):
+@router_auth_users.get(
+    "/",
+    response_model=Union[UserPage, List[UserResponse]],
+    dependencies=[Depends(query_budget(1))]
+)
+def list_users_auth(
+    ids: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    prefix: Optional[str] = Query(None, min_length=1, max_length=50),
+    db: Session = Depends(get_read_db)
+):
     """Alias for `/users/` exposed under `/auth/users/`.
 
     This preserves compatibility with frontend code that expects
     `/auth/users`.
     """
-    return list_users(db)
+    return list_users(ids, limit, cursor, prefix, db)
 
 
-@router_auth_users.get("/{user_id}", response_model=UserResponse)
-def get_user_auth(user_id: int, db: Session = Depends(get_db)):
+@router_auth_users.get(
+    "/{user_id}",
+    response_model=UserResponse,
+    dependencies=[Depends(query_budget(1))]
+)
+def get_user_auth(user_id: int, db: Session = Depends(get_read_db)):
     """Alias for `/users/{id}` exposed under `/auth/users/{id}`."""
     return get_user(user_id, db)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
+from typing import List, Optional
 
 
 class CommentCreate(BaseModel):
@@ -33,3 +34,15 @@ class CommentResponse(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CommentPage(BaseModel):
+    """Schema untuk satu halaman komentar.
+    
+    Attributes:
+        items (List[CommentResponse]): Komentar pada halaman ini
+        next_cursor (Optional[str]): Cursor untuk halaman berikutnya,
+            None jika sudah halaman terakhir
+    """
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
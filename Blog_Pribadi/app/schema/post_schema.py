@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class PostCreate(BaseModel):
     """Schema untuk membuat postingan baru.
@@ -14,6 +14,15 @@ class PostCreate(BaseModel):
     content: str
     category_id: Optional[int] = None
 
+class PostBatchCreate(BaseModel):
+    """Schema untuk membuat banyak postingan sekaligus.
+    
+    Attributes:
+        items (List[PostCreate]): Postingan yang akan dibuat, maksimal
+            `post_service.MAX_BATCH_POSTS` per request
+    """
+    items: List[PostCreate]
+
 class PostUpdate(BaseModel):
     """Schema untuk mengupdate postingan.
     
@@ -53,6 +62,8 @@ class PostResponse(BaseModel):
         username (str): Nama user penulis
         category_id (Optional[int]): ID kategori
         category (Optional[CategoryResponse]): Objek kategori dengan nama
+        comment_count (int): Jumlah komentar pada postingan
+        last_commented_at (Optional[datetime]): Waktu komentar terakhir
     
     Config:
         from_attributes: Mengizinkan konversi dari ORM objects
@@ -65,9 +76,106 @@ class PostResponse(BaseModel):
     username: str
     category_id: Optional[int] = None
     category: Optional[CategoryResponse] = None
+    comment_count: int = 0
+    last_commented_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+class PostPage(BaseModel):
+    """Schema untuk satu halaman listing postingan.
+    
+    Attributes:
+        items (List[PostResponse]): Postingan pada halaman ini
+        next_cursor (Optional[str]): Cursor untuk halaman berikutnya,
+            None jika sudah halaman terakhir
+    """
+    items: List[PostResponse]
+    next_cursor: Optional[str] = None
+
+class PostSummary(BaseModel):
+    """Schema ringkas untuk listing postingan (`view=summary` / `fields=`).
+    
+    Hanya field yang diminta yang ikut dalam response; konten penuh
+    diganti `excerpt` yang dipotong di database.
+    
+    Attributes:
+        id (int): ID unik postingan
+        title (Optional[str]): Judul postingan
+        content (Optional[str]): Isi postingan (hanya jika diminta lewat `fields`)
+        excerpt (Optional[str]): Potongan awal konten
+        excerpt_truncated (Optional[bool]): True jika konten lebih panjang dari excerpt
+        created_at (Optional[datetime]): Waktu pembuatan
+        author_id (Optional[int]): ID user penulis
+        username (Optional[str]): Nama user penulis
+        category_id (Optional[int]): ID kategori
+        category (Optional[CategoryResponse]): Objek kategori dengan nama
+        comment_count (Optional[int]): Jumlah komentar pada postingan
+        last_commented_at (Optional[datetime]): Waktu komentar terakhir
+    """
+    id: int
+    title: Optional[str] = None
+    content: Optional[str] = None
+    excerpt: Optional[str] = None
+    excerpt_truncated: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    author_id: Optional[int] = None
+    username: Optional[str] = None
+    category_id: Optional[int] = None
+    category: Optional[CategoryResponse] = None
+    comment_count: Optional[int] = None
+    last_commented_at: Optional[datetime] = None
+
+class PostSummaryPage(BaseModel):
+    """Schema untuk satu halaman listing postingan ringkas.
+    
+    Attributes:
+        items (List[PostSummary]): Postingan pada halaman ini
+        next_cursor (Optional[str]): Cursor untuk halaman berikutnya,
+            None jika sudah halaman terakhir
+    """
+    items: List[PostSummary]
+    next_cursor: Optional[str] = None
+
+class PostSearchResult(BaseModel):
+    """Schema untuk satu hasil pencarian postingan.
+    
+    Attributes:
+        id (int): ID unik postingan
+        title (str): Judul postingan
+        title_highlight (str): Judul dengan kata yang cocok diapit `<mark>`
+        snippet (str): Potongan konten di sekitar kata yang cocok,
+            kata yang cocok diapit `<mark>` (teks lain belum di-escape)
+        created_at (datetime): Waktu pembuatan
+        author_id (int): ID user penulis
+        username (str): Nama user penulis
+        category_id (Optional[int]): ID kategori
+        category (Optional[CategoryResponse]): Objek kategori dengan nama
+        comment_count (int): Jumlah komentar pada postingan
+        score (float): Skor relevansi, makin besar makin relevan
+    """
+    id: int
+    title: str
+    title_highlight: str
+    snippet: str
+    created_at: datetime
+    author_id: int
+    username: str
+    category_id: Optional[int] = None
+    category: Optional[CategoryResponse] = None
+    comment_count: int = 0
+    score: float
+
+class PostSearchPage(BaseModel):
+    """Schema untuk satu halaman hasil pencarian.
+    
+    Attributes:
+        items (List[PostSearchResult]): Hasil terurut relevansi
+        next_offset (Optional[int]): Offset halaman berikutnya,
+            None jika sudah halaman terakhir
+    """
+    items: List[PostSearchResult]
+    next_offset: Optional[int] = None
+
 class CommentResponse(BaseModel):
     """Schema untuk respons data komentar.
     
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List, Optional
 
 class UserRegister(BaseModel):
     """Schema untuk registrasi user baru.
@@ -35,3 +36,14 @@ class UserResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+class UserPage(BaseModel):
+    """Schema untuk satu halaman direktori user.
+    
+    Attributes:
+        items (List[UserResponse]): User pada halaman ini, urut username
+        next_cursor (Optional[str]): Cursor untuk halaman berikutnya,
+            None jika sudah halaman terakhir
+    """
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
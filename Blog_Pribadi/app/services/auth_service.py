@@ -1,36 +1,84 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 
-from app.database.models import User
+from app.core.hashing import password_hasher
 from app.core.security import create_access_token
+from app.database.models import User
+from app.repositories import async_user_repository, user_repository
+
+async def _get_user_by_username(db, username: str):
+    """Mencari user berdasarkan username pada session sync maupun async."""
+    if isinstance(db, AsyncSession):
+        return await async_user_repository.get_user_by_username(db, username)
+    return await run_in_threadpool(user_repository.get_user_by_username, db, username)
+
+async def _create_user(db, user: User):
+    """Menyimpan user baru pada session sync maupun async."""
+    if isinstance(db, AsyncSession):
+        return await async_user_repository.create_user(db, user)
+    return await run_in_threadpool(user_repository.create_user, db, user)
+
+async def authenticate_user(db: Session, username: str, password: str):
+    """Memverifikasi username dan password user.
+    
+    Query database dijalankan secara async (AsyncSession) atau di
+    threadpool (Session), dan verifikasi password di process pool
+    hashing, sehingga event loop tidak pernah terblokir.
+    
+    Args:
+        db (Session | AsyncSession): Database session
+        username (str): Username user
+        password (str): Password user
+        
+    Returns:
+        User: User jika username dan password cocok, None jika tidak
+        
+    Raises:
+        HTTPException: 429 jika antrean hashing penuh
+    """
+    user = await _get_user_by_username(db, username)
+    if not user or not await password_hasher.verify(password, user.password):
+        return None
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+    return user
 
-def verify_password(plain, hashed):
-    """Memverifikasi password plain text dengan hash-nya.
+async def register_user(db: Session, username: str, password: str):
+    """Membuat user baru dengan password yang sudah di-hash.
     
     Args:
-        plain (str): Password plain text
-        hashed (str): Password yang sudah di-hash
+        db (Session | AsyncSession): Database session
+        username (str): Username user baru
+        password (str): Password plain text
         
     Returns:
-        bool: True jika password cocok, False jika tidak
+        User: User yang baru dibuat, None jika username sudah digunakan
+        
+    Raises:
+        HTTPException: 429 jika antrean hashing penuh
     """
-    return pwd_context.verify(plain, hashed)
+    if await _get_user_by_username(db, username):
+        return None
+
+    user = User(
+        username=username,
+        password=await password_hasher.hash(password)
+    )
+    return await _create_user(db, user)
 
-def login_user(db: Session, username: str, password: str):
+async def login_user(db: Session, username: str, password: str):
     """Memverifikasi user login dan membuat token akses.
     
     Args:
-        db (Session): Database session
+        db (Session | AsyncSession): Database session
         username (str): Username user
         password (str): Password user
         
     Returns:
         str: Access token jika login berhasil, None jika gagal
     """
-    user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.password):
+    user = await authenticate_user(db, username, password)
+    if not user:
         return None
 
     return create_access_token({"user_id": user.id})
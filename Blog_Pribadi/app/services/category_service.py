@@ -1,4 +1,150 @@
+"""Peta kategori in-memory.
+
+Kategori hanya sedikit dan hampir tidak pernah berubah, jadi seluruh
+tabel disimpan di memori sebagai `{id: {"id", "name"}}`. Response
+postingan menyematkan `category` dari peta ini tanpa JOIN, dan
+GET /categories/ dilayani tanpa query.
+
+Peta dimuat saat startup dan setelah kategori dibuat lewat API.
+Kategori yang dibuat oleh proses (worker) lain terlihat saat ada
+`category_id` yang belum dikenal (muat ulang paling sering sekali per
+`MISS_RELOAD_INTERVAL`) atau setelah peta berumur `CATEGORY_MAP_TTL`.
+
+Dalam mode `DB_ASYNC` muat ulang memakai session AsyncSession endpoint
+yang sedang berjalan (`current_sync_session`), sehingga tidak memblokir
+event loop dengan koneksi sync.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.async_db import current_sync_session
+from app.database.db import SessionLocal
 from app.database.models import Category
+from app.repositories import async_category_repository, category_repository
+
+# Umur maksimal peta sebelum dimuat ulang (detik)
+CATEGORY_MAP_TTL = 60.0
+# Jeda minimal antar muat ulang karena category_id tidak dikenal (detik)
+MISS_RELOAD_INTERVAL = 1.0
+
+_categories = {}
+_loaded_at = None
+_lock = threading.Lock()
+
 
 def build_category(data):
     return Category(name=data.name)
+
+
+def load_categories(db: Session = None):
+    """Memuat ulang seluruh peta kategori dari database.
+    
+    Args:
+        db (Session): Database session; None untuk membuka session sendiri
+    """
+    if db is None:
+        with SessionLocal() as session:
+            rows = category_repository.get_categories(session)
+    else:
+        rows = category_repository.get_categories(db)
+    _set_categories(rows)
+
+
+async def load_categories_async(db: AsyncSession):
+    """Memuat ulang seluruh peta kategori lewat AsyncSession.
+    
+    Args:
+        db (AsyncSession): Database session async
+    """
+    _set_categories(await async_category_repository.get_categories(db))
+
+
+def _set_categories(rows):
+    global _categories, _loaded_at
+    # Peta baru menggantikan yang lama sekaligus; pembaca tidak perlu lock
+    _categories = {
+        row.id: {"id": row.id, "name": row.name} for row in sorted(rows, key=lambda row: row.id)
+    }
+    _loaded_at = time.monotonic()
+
+
+def _is_older_than(seconds: float):
+    return _loaded_at is None or time.monotonic() - _loaded_at >= seconds
+
+
+def _reload_if_older_than(seconds: float, db: Session = None):
+    if not _is_older_than(seconds):
+        return
+    in_run_sync = current_sync_session() is not None
+    # Di dalam run_sync, pemegang lock menyerahkan event loop ke request lain
+    # selama menunggu database; menunggu lock di sana akan membuat deadlock,
+    # jadi request lain memakai peta yang ada
+    if not _lock.acquire(blocking=not in_run_sync):
+        return
+    try:
+        if _is_older_than(seconds):
+            load_categories(db or current_sync_session())
+    finally:
+        _lock.release()
+
+
+def get_category(category_id: Optional[int]):
+    """Mengambil kategori dari peta in-memory.
+    
+    Args:
+        category_id (Optional[int]): ID kategori
+        
+    Returns:
+        dict: `{"id", "name"}` kategori, None jika category_id None atau
+            kategori tidak ditemukan
+    """
+    if category_id is None:
+        return None
+    category = _categories.get(category_id)
+    if category is None:
+        _reload_if_older_than(MISS_RELOAD_INTERVAL)
+        category = _categories.get(category_id)
+    return category
+
+
+def get_all_categories(db: Session = None):
+    """Mengembalikan semua kategori terurut ID.
+    
+    Args:
+        db (Session): Database session untuk muat ulang peta yang kedaluwarsa;
+            None untuk membuka session sendiri
+    
+    Returns:
+        List[dict]: `{"id", "name"}` setiap kategori
+    """
+    _reload_if_older_than(CATEGORY_MAP_TTL, db)
+    return list(_categories.values())
+
+
+def create_category(db: Session, data):
+    """Membuat kategori baru lalu memuat ulang peta kategori.
+    
+    Args:
+        db (Session): Database session
+        data: Data kategori (CategoryCreate)
+        
+    Returns:
+        Category: Kategori yang baru dibuat
+        
+    Raises:
+        HTTPException: 400 jika nama kategori sudah digunakan
+    """
+    try:
+        category = category_repository.create_category(db, build_category(data))
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Nama kategori sudah digunakan")
+    load_categories(db)
+    return category
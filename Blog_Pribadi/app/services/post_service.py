@@ -1,9 +1,90 @@
+import csv
+import io
+from app.database.db import engine, read_from_replica, replicas
 from app.database.models import Post, User
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.repositories import post_repository
 from datetime import datetime
-from app.schema.post_schema import PostResponse
+from typing import Optional, Tuple
+from app.schema.post_schema import PostResponse, PostPage, PostSummary, PostSummaryPage
+from app.core.pagination import DEFAULT_PAGE_SIZE, keyset_filter, next_cursor
+from app.core.cache import LRUCache
+from app.core import fast_json
+from app.core.conditional import make_etag
+from app.services import category_service, user_service
+
+MAX_BATCH_POSTS = 500
+
+DEFAULT_EXCERPT_LENGTH = 200
+MAX_EXCERPT_LENGTH = 1000
+
+# Field yang dikirim `view=summary`
+SUMMARY_FIELDS = (
+    "id", "title", "excerpt", "excerpt_truncated", "created_at", "author_id",
+    "username", "category_id", "category", "comment_count", "last_commented_at"
+)
+# Field yang boleh diminta lewat `fields=`
+SELECTABLE_FIELDS = SUMMARY_FIELDS + ("content",)
+
+# Kolom export arsip (GET /posts/export), sesuai urutan kolom CSV
+EXPORT_FIELDS = (
+    "id", "title", "content", "created_at", "updated_at", "author_id",
+    "username", "category_id", "comment_count", "last_commented_at"
+)
+EXPORT_CHUNK_SIZE = 1000
+
+# Cache response postingan; ganti dengan backend lain (mis. Redis) yang
+# mengimplementasikan CacheBackend bila dijalankan multi-proses.
+post_detail_cache = LRUCache(maxsize=1024, ttl=60)
+post_list_cache = LRUCache(maxsize=256, ttl=30)
+
+def invalidate_post_cache(post_id: Optional[int] = None):
+    """Menghapus cache yang terpengaruh oleh perubahan postingan.
+    
+    Args:
+        post_id (Optional[int]): ID postingan yang berubah; None jika hanya
+            listing yang perlu dihapus (mis. postingan baru)
+    """
+    if post_id is not None:
+        post_detail_cache.delete(str(post_id))
+        post_detail_cache.delete(f"json:{post_id}")
+    post_list_cache.clear()
+
+def _cache_get(cache, key, version=None):
+    """Mengambil entry cache yang dibuat untuk `version` yang sama.
+    
+    Entry disimpan bersama ETag yang dikirim bersamanya sehingga body
+    lama tidak pernah terkirim dengan ETag yang lebih baru.
+    """
+    entry = cache.get(key)
+    if entry is None or entry[0] != version:
+        return None
+    return entry[1]
+
+def _cache_set(db, cache, key, value, generation, version=None):
+    """Menyimpan `value` ke cache bersama versinya (lihat `_cache_get`).
+    
+    Hasil baca dari read replica tidak disimpan: replica bisa tertinggal
+    dari primary sehingga entry basi akan mengisi ulang cache yang baru
+    saja dihapus `invalidate_post_cache`. Begitu juga jika key dihapus
+    setelah `generation` diambil (write yang bersamaan dengan pembacaan).
+    """
+    if read_from_replica(db):
+        return
+    cache.set(key, (version, value), generation=generation)
+
+def cache_stats():
+    """Mengembalikan metrik hit/miss/eviction semua cache postingan.
+    
+    Returns:
+        dict: Metrik per cache
+    """
+    return {
+        "post_detail": post_detail_cache.stats(),
+        "post_list": post_list_cache.stats()
+    }
 
 def build_post(data, user_id: int):
     """Membuat object Post dari data input.
@@ -22,71 +103,376 @@ def build_post(data, user_id: int):
         author_id=user_id
     )
 
-def get_posts(db: Session):
-    """Mengambil semua postingan beserta informasi penulis.
+def post_data(post: Post, username: str):
+    """Membuat dict field PostResponse dari object Post dan username penulis.
+    
+    `category` diambil dari peta kategori in-memory, bukan lewat JOIN.
+    
+    Args:
+        post (Post): Object Post dari database
+        username (str): Username penulis postingan
+        
+    Returns:
+        dict: Field postingan dengan tipe dasar (siap di-encode JSON)
+    """
+    return {
+        "id": post.id,
+        "title": post.title,
+        "content": post.content,
+        "created_at": post.created_at,
+        "author_id": post.author_id,
+        "username": username,
+        "category_id": post.category_id,
+        "category": category_service.get_category(post.category_id),
+        "comment_count": post.comment_count or 0,
+        "last_commented_at": post.last_commented_at
+    }
+
+def build_post_response(post: Post, username: str):
+    """Membuat PostResponse dari object Post dan username penulis.
+    
+    Args:
+        post (Post): Object Post dari database
+        username (str): Username penulis postingan
+        
+    Returns:
+        PostResponse: Data postingan untuk response API
+    """
+    return PostResponse(**post_data(post, username))
+
+def parse_fields(fields: str) -> Tuple[str, ...]:
+    """Memvalidasi parameter `fields` (daftar nama field dipisah koma).
+    
+    Args:
+        fields (str): Mis. `"id,title,excerpt"`
+        
+    Returns:
+        Tuple[str, ...]: Nama field unik sesuai urutan, `id` selalu disertakan
+        
+    Raises:
+        HTTPException: 400 jika ada field yang tidak dikenal
+    """
+    names = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if not name or name in names:
+            continue
+        if name not in SELECTABLE_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Field tidak dikenal: {name}. Pilihan: {', '.join(SELECTABLE_FIELDS)}"
+            )
+        names.append(name)
+    return tuple(names)
+
+def _filter_listing(query, cursor, category_id, author_id):
+    """Menerapkan filter kategori/penulis, keyset cursor dan urutan listing."""
+    if category_id is not None:
+        query = query.filter(Post.category_id == category_id)
+    if author_id is not None:
+        query = query.filter(Post.author_id == author_id)
+    if cursor:
+        query = query.filter(keyset_filter(Post.created_at, Post.id, cursor))
+    return query.order_by(Post.created_at.desc(), Post.id.desc())
+
+def get_posts(
+    db: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    category_id: Optional[int] = None,
+    author_id: Optional[int] = None,
+    version: Optional[str] = None
+):
+    """Mengambil satu halaman postingan (terbaru dulu) beserta informasi penulis.
+    
+    Menggunakan keyset pagination pada index `(created_at, id)` (atau
+    `(category_id, created_at, id)` / `(author_id, created_at, id)` saat
+    difilter) sehingga biaya setiap halaman konstan berapa pun jumlah postingan.
+    
+    Args:
+        db (Session): Database session
+        limit (int): Jumlah maksimal postingan per halaman
+        cursor (Optional[str]): Cursor dari halaman sebelumnya
+        category_id (Optional[int]): Hanya postingan pada kategori ini
+        author_id (Optional[int]): Hanya postingan milik user ini
+        version (Optional[str]): ETag yang dikirim bersama halaman ini;
+            halaman cache milik ETag lain diabaikan
+        
+    Returns:
+        PostPage: Postingan pada halaman ini dan cursor halaman berikutnya
+    """
+    cache_key = f"{limit}:{cursor!r}:{category_id!r}:{author_id!r}"
+    cached = _cache_get(post_list_cache, cache_key, version)
+    if cached is not None:
+        return cached
+    # Diambil sebelum membaca database, lihat `_cache_set`
+    generation = post_list_cache.generation()
+
+    posts, cursor_next = _fetch_post_page(db, limit, cursor, category_id, author_id)
+    result = [build_post_response(post, username) for post, username in posts]
+    
+    page = PostPage(items=result, next_cursor=cursor_next)
+    _cache_set(db, post_list_cache, cache_key, page, generation, version)
+    return page
+
+def get_posts_json(
+    db: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    version: Optional[str] = None
+):
+    """Seperti `get_posts`, tetapi langsung menghasilkan bytes JSON.
+    
+    Row di-encode tanpa membangun model Pydantic (lihat `app.core.fast_json`);
+    bytes hasilnya di-cache sehingga cache hit tidak perlu serialisasi lagi.
+    
+    Args:
+        db (Session): Database session
+        limit (int): Jumlah maksimal postingan per halaman
+        cursor (Optional[str]): Cursor dari halaman sebelumnya
+        version (Optional[str]): ETag yang dikirim bersama halaman ini
+        
+    Returns:
+        bytes: JSON dengan bentuk yang sama dengan PostPage
+    """
+    cache_key = f"json:{limit}:{cursor!r}"
+    cached = _cache_get(post_list_cache, cache_key, version)
+    if cached is not None:
+        return cached
+    generation = post_list_cache.generation()
+
+    posts, cursor_next = _fetch_post_page(db, limit, cursor)
+    body = fast_json.dumps({
+        "items": [post_data(post, username) for post, username in posts],
+        "next_cursor": cursor_next
+    })
+    _cache_set(db, post_list_cache, cache_key, body, generation, version)
+    return body
+
+def _with_usernames(db, posts):
+    """Memasangkan setiap Post dengan username penulis dari `user_service`."""
+    usernames = user_service.get_usernames(db, (post.author_id for post in posts))
+    return [
+        (post, usernames.get(post.author_id, user_service.UNKNOWN_USERNAME)) for post in posts
+    ]
+
+def _fetch_post_page(db, limit, cursor, category_id=None, author_id=None):
+    """Mengambil row (Post, username) satu halaman dan cursor berikutnya."""
+    # Ambil satu row ekstra untuk mengetahui apakah masih ada halaman berikutnya
+    posts = _filter_listing(db.query(Post), cursor, category_id, author_id).limit(limit + 1).all()
+    cursor_next = next_cursor(posts, limit, lambda post: (post.created_at, post.id))
+    return _with_usernames(db, posts[:limit]), cursor_next
+
+def get_listing_validators(db: Session, *variant):
+    """Menghitung ETag listing postingan.
+    
+    Cukup satu query agregat `count(*)` + `max(updated_at)` (index
+    `ix_posts_updated_at`): postingan baru/diedit menggeser max, postingan
+    yang dihapus mengubah jumlah row. Listing tidak punya Last-Modified
+    karena `max(updated_at)` tidak berubah saat postingan dihapus.
+    
+    Args:
+        db (Session): Database session
+        *variant: Parameter yang menentukan isi halaman (limit, cursor, ...)
+        
+    Returns:
+        tuple: (ETag, None)
+    """
+    count, last_modified = db.query(func.count(Post.id), func.max(Post.updated_at)).one()
+    return make_etag("posts", count, last_modified, *variant), None
+
+def get_post_validators(db: Session, post_id: int):
+    """Menghitung ETag dan Last-Modified satu postingan.
+    
+    Args:
+        db (Session): Database session
+        post_id (int): ID postingan
+        
+    Returns:
+        tuple: (ETag, waktu perubahan terakhir) atau None jika tidak ditemukan
+    """
+    row = db.query(Post.updated_at).filter(Post.id == post_id).first()
+    if row is None:
+        return None
+    return make_etag("post", post_id, row.updated_at), row.updated_at
+
+def get_post_summaries(
+    db: Session,
+    fields: Tuple[str, ...] = SUMMARY_FIELDS,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    excerpt_length: int = DEFAULT_EXCERPT_LENGTH,
+    category_id: Optional[int] = None,
+    author_id: Optional[int] = None,
+    version: Optional[str] = None
+):
+    """Mengambil satu halaman postingan yang hanya berisi field tertentu.
+    
+    Hanya kolom yang diminta yang di-SELECT: `content` tidak dibaca kecuali
+    diminta, `excerpt` dipotong di database dengan `substr`, tabel
+    users tidak di-JOIN: `username` diambil dari cache `user_service`, dan
+    `category` diisi dari peta kategori in-memory. Pagination sama dengan
+    `get_posts`.
     
     Args:
         db (Session): Database session
+        fields (Tuple[str, ...]): Field yang dikirim (lihat `parse_fields`)
+        limit (int): Jumlah maksimal postingan per halaman
+        cursor (Optional[str]): Cursor dari halaman sebelumnya
+        excerpt_length (int): Panjang maksimal excerpt (karakter)
+        category_id (Optional[int]): Hanya postingan pada kategori ini
+        author_id (Optional[int]): Hanya postingan milik user ini
+        version (Optional[str]): ETag yang dikirim bersama halaman ini
         
     Returns:
-        List[PostResponse]: Daftar semua postingan dengan username penulis
-    """
-    # JOIN DENGAN BENAR MENGGUNAKAN author_id
-    posts = db.query(
-        Post,
-        User.username
-    ).join(
-        User, Post.author_id == User.id
-    ).all()
-    
-    result = []
-    for post, username in posts:
-        post_data = {
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "created_at": post.created_at,
-            "author_id": post.author_id,
-            "username": username,
-            "category_id": post.category_id
-        }
-        result.append(PostResponse(**post_data))
-    
-    return result
-
-def get_post_detail(db: Session, post_id: int):
+        PostSummaryPage: Postingan pada halaman ini dan cursor halaman berikutnya
+    """
+    cache_key = (
+        f"{','.join(fields)}:{excerpt_length}:{limit}:{cursor!r}:"
+        f"{category_id!r}:{author_id!r}"
+    )
+    cached = _cache_get(post_list_cache, cache_key, version)
+    if cached is not None:
+        return cached
+    generation = post_list_cache.generation()
+
+    want_excerpt = "excerpt" in fields or "excerpt_truncated" in fields
+    columns = [Post.id, Post.created_at]
+    for name in fields:
+        if name in ("id", "created_at", "excerpt", "excerpt_truncated", "category", "username"):
+            continue
+        columns.append(getattr(Post, name))
+    if "category" in fields and "category_id" not in fields:
+        # `category` diisi dari peta kategori in-memory berdasarkan category_id
+        columns.append(Post.category_id)
+    if "username" in fields and "author_id" not in fields:
+        columns.append(Post.author_id)
+    if want_excerpt:
+        # Satu karakter ekstra menandakan konten masih berlanjut
+        columns.append(func.substr(Post.content, 1, excerpt_length + 1).label("excerpt"))
+
+    rows = _filter_listing(db.query(*columns), cursor, category_id, author_id).limit(limit + 1).all()
+    usernames = {}
+    if "username" in fields:
+        usernames = user_service.get_usernames(db, (row.author_id for row in rows[:limit]))
+
+    items = []
+    for row in rows[:limit]:
+        data = {name: row._mapping[name] for name in fields if name in row._mapping}
+        if want_excerpt:
+            excerpt = row.excerpt or ""
+            if "excerpt" in fields:
+                data["excerpt"] = excerpt[:excerpt_length]
+            if "excerpt_truncated" in fields:
+                data["excerpt_truncated"] = len(excerpt) > excerpt_length
+        if "category" in fields:
+            data["category"] = category_service.get_category(row.category_id)
+        if "username" in fields:
+            data["username"] = usernames.get(row.author_id, user_service.UNKNOWN_USERNAME)
+        items.append(PostSummary(**data))
+
+    page = PostSummaryPage(
+        items=items,
+        next_cursor=next_cursor(rows, limit, lambda row: (row.created_at, row.id))
+    )
+    _cache_set(db, post_list_cache, cache_key, page, generation, version)
+    return page
+
+def iter_post_export(export_format: str = "ndjson", chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Menghasilkan seluruh arsip postingan sebagai NDJSON atau CSV per potongan.
+    
+    Row diambil lewat server-side cursor (`stream_results` + `yield_per`)
+    pada koneksi sendiri (read replica bila ada), sehingga memori tetap
+    datar berapa pun jumlah postingan dan byte pertama langsung terkirim.
+    Koneksi ditutup saat generator selesai atau client memutus koneksi.
+    
+    Args:
+        export_format (str): `ndjson` atau `csv`
+        chunk_size (int): Jumlah row per potongan
+        
+    Yields:
+        bytes: Potongan output (baris CSV diawali header)
+    """
+    columns = [User.username if name == "username" else getattr(Post, name) for name in EXPORT_FIELDS]
+    query = select(*columns).join(User, Post.author_id == User.id).order_by(Post.id)
+
+    with (replicas.choose() or engine).connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            yield buffer.getvalue().encode("utf-8")
+            for rows in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(
+                    ["" if value is None else value.isoformat() if isinstance(value, datetime) else value
+                     for value in row]
+                    for row in rows
+                )
+                yield buffer.getvalue().encode("utf-8")
+        else:
+            for rows in result.mappings().partitions():
+                yield b"".join(fast_json.dumps(dict(row)) + b"\n" for row in rows)
+
+def get_post_detail(db: Session, post_id: int, version: Optional[str] = None):
     """Mengambil detail satu postingan beserta informasi penulis.
     
     Args:
         db (Session): Database session
         post_id (int): ID postingan
+        version (Optional[str]): ETag yang dikirim bersama response
         
     Returns:
         PostResponse: Detail postingan atau None jika tidak ditemukan
     """
-    result = db.query(
-        Post,
-        User.username
-    ).join(
-        User, Post.author_id == User.id
-    ).filter(
-        Post.id == post_id
-    ).first()
-    
+    cached = _cache_get(post_detail_cache, str(post_id), version)
+    if cached is not None:
+        return cached
+    generation = post_detail_cache.generation()
+
+    result = _fetch_post(db, post_id)
     if not result:
         return None
     
     post, username = result
     
-    return PostResponse(
-        id=post.id,
-        title=post.title,
-        content=post.content,
-        created_at=post.created_at,
-        author_id=post.author_id,
-        username=username,
-        category_id=post.category_id
-    )
+    response = build_post_response(post, username)
+    _cache_set(db, post_detail_cache, str(post_id), response, generation, version)
+    return response
+
+def get_post_detail_json(db: Session, post_id: int, version: Optional[str] = None):
+    """Seperti `get_post_detail`, tetapi langsung menghasilkan bytes JSON.
+    
+    Args:
+        db (Session): Database session
+        post_id (int): ID postingan
+        version (Optional[str]): ETag yang dikirim bersama response
+        
+    Returns:
+        bytes: JSON dengan bentuk PostResponse atau None jika tidak ditemukan
+    """
+    cache_key = f"json:{post_id}"
+    cached = _cache_get(post_detail_cache, cache_key, version)
+    if cached is not None:
+        return cached
+    generation = post_detail_cache.generation()
+
+    result = _fetch_post(db, post_id)
+    if not result:
+        return None
+
+    body = fast_json.dumps(post_data(*result))
+    _cache_set(db, post_detail_cache, cache_key, body, generation, version)
+    return body
+
+def _fetch_post(db, post_id):
+    """Mengambil row (Post, username) satu postingan, None jika tidak ditemukan."""
+    post = db.query(Post).filter(Post.id == post_id).first()
+    if post is None:
+        return None
+    return _with_usernames(db, [post])[0]
 
 def edit_post(db: Session, post_id: int, title: str, content: str, user_id: int):
     """Mengedit postingan (hanya untuk pemilik).
@@ -114,6 +500,7 @@ def edit_post(db: Session, post_id: int, title: str, content: str, user_id: int)
     post.title = title
     post.content = content
     db.commit()
+    invalidate_post_cache(post_id)
     db.refresh(post)
     return post
 
@@ -137,5 +524,63 @@ def create_post(db: Session, data, user_id: int):
     )
     db.add(post)
     db.commit()
+    invalidate_post_cache()
     db.refresh(post)
-    return post
\ No newline at end of file
+    return post
+
+def create_posts(db: Session, items, user_id: int, username: str):
+    """Membuat banyak postingan dalam satu transaksi.
+    
+    Kategori divalidasi dari peta kategori in-memory, semua postingan di-INSERT
+    dalam satu flush, dan response dibangun dari object yang sudah ada
+    di memori sebelum commit sehingga tidak ada query ulang.
+    
+    Args:
+        db (Session): Database session
+        items (List[PostCreate]): Data postingan
+        user_id (int): ID user yang membuat postingan
+        username (str): Username user yang membuat postingan
+        
+    Returns:
+        List[PostResponse]: Postingan yang dibuat, sesuai urutan input
+        
+    Raises:
+        HTTPException: 400 jika jumlah postingan di luar batas atau ada
+            kategori yang tidak ditemukan
+    """
+    if not items:
+        raise HTTPException(status_code=400, detail="items tidak boleh kosong")
+    if len(items) > MAX_BATCH_POSTS:
+        raise HTTPException(status_code=400, detail=f"Maksimal {MAX_BATCH_POSTS} postingan per request")
+
+    category_ids = {item.category_id for item in items if item.category_id is not None}
+    if category_ids:
+        missing = sorted(
+            category_id for category_id in category_ids
+            if category_service.get_category(category_id) is None
+        )
+        if missing:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Kategori tidak ditemukan: {', '.join(map(str, missing))}"
+            )
+
+    now = datetime.utcnow()
+    posts = [
+        Post(
+            title=item.title,
+            content=item.content,
+            author_id=user_id,
+            category_id=item.category_id,
+            created_at=now,
+            last_commented_at=None
+        )
+        for item in items
+    ]
+    db.add_all(posts)
+    db.flush()
+    # Dibangun sebelum commit: setelah commit atribut di-expire dan akan di-load ulang
+    result = [build_post_response(post, username) for post in posts]
+    db.commit()
+    invalidate_post_cache()
+    return result
\ No newline at end of file
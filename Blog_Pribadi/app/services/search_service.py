@@ -0,0 +1,153 @@
+import re
+from typing import List
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database.search import FTS_TABLE
+from app.schema.post_schema import PostSearchResult, PostSearchPage
+from app.services import category_service
+
+MARK_START = "<mark>"
+MARK_END = "</mark>"
+SNIPPET_TOKENS = 24
+MAX_SEARCH_OFFSET = 1000
+
+# Bobot BM25 per kolom FTS: kecocokan di judul lebih penting dari konten
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+SQLITE_SEARCH = f"""
+    SELECT p.id, p.title, p.created_at, p.author_id, p.category_id,
+           p.comment_count, u.username,
+           highlight({FTS_TABLE}, 0, :mark_start, :mark_end) AS title_highlight,
+           snippet({FTS_TABLE}, 1, :mark_start, :mark_end, '…', :snippet_tokens) AS snippet,
+           bm25({FTS_TABLE}, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) AS score
+    FROM {FTS_TABLE}
+    JOIN posts p ON p.id = {FTS_TABLE}.rowid
+    JOIN users u ON u.id = p.author_id
+    WHERE {FTS_TABLE} MATCH :query
+    ORDER BY score, p.id DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+MYSQL_SEARCH = """
+    SELECT p.id, p.title, p.content, p.created_at, p.author_id, p.category_id,
+           p.comment_count, u.username,
+           MATCH(p.title, p.content) AGAINST (:query IN NATURAL LANGUAGE MODE) AS score
+    FROM posts p
+    JOIN users u ON u.id = p.author_id
+    WHERE MATCH(p.title, p.content) AGAINST (:query IN NATURAL LANGUAGE MODE)
+    ORDER BY score DESC, p.id DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+def tokenize(q: str):
+    """Memecah query pencarian menjadi kata (huruf/angka saja).
+    
+    Args:
+        q (str): Query dari user
+        
+    Returns:
+        List[str]: Daftar kata
+    """
+    return re.findall(r"\w+", q, re.UNICODE)
+
+def build_fts_query(tokens: List[str]):
+    """Membuat query FTS5 yang aman dari daftar kata.
+    
+    Setiap kata di-quote sehingga karakter sintaks FTS5 dari input user
+    tidak ditafsirkan, dan kata terakhir memakai prefix match agar
+    pencarian saat mengetik tetap menemukan hasil.
+    
+    Args:
+        tokens (List[str]): Daftar kata dari `tokenize`
+        
+    Returns:
+        str: Query MATCH FTS5 (semua kata harus ada)
+    """
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+def _highlight(value: str, tokens: List[str]):
+    """Menandai kata yang cocok dengan MARK_START/MARK_END (tanpa FTS5)."""
+    pattern = re.compile("|".join(re.escape(token) for token in tokens), re.IGNORECASE)
+    return pattern.sub(lambda match: f"{MARK_START}{match.group(0)}{MARK_END}", value)
+
+def _snippet(content: str, tokens: List[str], width: int = 160):
+    """Potongan konten di sekitar kata pertama yang cocok (tanpa FTS5)."""
+    lowered = content.lower()
+    positions = [lowered.find(token.lower()) for token in tokens]
+    positions = [position for position in positions if position >= 0]
+    start = max(0, min(positions) - width // 4) if positions else 0
+    excerpt = content[start:start + width]
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + width < len(content) else ""
+    return prefix + _highlight(excerpt, tokens) + suffix
+
+def search_posts(db: Session, q: str, limit: int, offset: int = 0):
+    """Mencari postingan berdasarkan judul dan konten.
+    
+    SQLite memakai index FTS5 dengan ranking BM25 (judul diberi bobot
+    lebih tinggi) serta highlight/snippet dari FTS5; MySQL memakai
+    FULLTEXT index (natural language mode).
+    
+    Args:
+        db (Session): Database session
+        q (str): Kata kunci pencarian
+        limit (int): Jumlah hasil per halaman
+        offset (int): Jumlah hasil yang dilewati
+        
+    Returns:
+        PostSearchPage: Hasil pencarian terurut relevansi dan offset halaman berikutnya
+        
+    Raises:
+        HTTPException: 400 jika offset terlalu besar, 501 jika database
+            tidak mendukung full-text search
+    """
+    if offset > MAX_SEARCH_OFFSET:
+        raise HTTPException(status_code=400, detail=f"Offset maksimal {MAX_SEARCH_OFFSET}")
+
+    tokens = tokenize(q)
+    if not tokens:
+        return PostSearchPage(items=[])
+
+    backend = db.get_bind().dialect.name
+    params = {"limit": limit + 1, "offset": offset}
+
+    if backend == "sqlite":
+        rows = db.execute(text(SQLITE_SEARCH), {
+            **params,
+            "query": build_fts_query(tokens),
+            "mark_start": MARK_START,
+            "mark_end": MARK_END,
+            "snippet_tokens": SNIPPET_TOKENS
+        }).mappings().all()
+        # bm25() bernilai negatif: makin kecil makin relevan
+        items = [
+            PostSearchResult(
+                **{**row, "score": -row["score"]},
+                category=category_service.get_category(row["category_id"])
+            )
+            for row in rows[:limit]
+        ]
+    elif backend == "mysql":
+        rows = db.execute(text(MYSQL_SEARCH), {**params, "query": " ".join(tokens)}).mappings().all()
+        items = [
+            PostSearchResult(
+                **{key: value for key, value in row.items() if key != "content"},
+                title_highlight=_highlight(row["title"], tokens),
+                snippet=_snippet(row["content"], tokens),
+                category=category_service.get_category(row["category_id"])
+            )
+            for row in rows[:limit]
+        ]
+    else:
+        raise HTTPException(status_code=501, detail="Full-text search tidak didukung database ini")
+
+    return PostSearchPage(
+        items=items,
+        next_offset=offset + limit if len(rows) > limit else None
+    )
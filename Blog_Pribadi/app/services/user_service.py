@@ -0,0 +1,197 @@
+"""Cache id -> username untuk semua response yang menampilkan penulis.
+
+Listing/detail postingan dan komentar hanya membaca `author_id` /
+`user_id`; username-nya diambil dari `username_cache` (LRU dengan TTL).
+ID yang belum ada di cache diambil sekaligus dengan satu query `IN`,
+sehingga tidak perlu JOIN ke tabel users dan cache yang hangat tidak
+menambah query sama sekali. `get_usernames_async` melakukan hal yang sama
+lewat AsyncSession (mode `DB_ASYNC`).
+
+Entry dihapus setelah commit transaksi yang mengubah/menghapus User
+lewat ORM di proses ini; pengisian cache memakai generation sehingga
+username lama yang dibaca sebelum commit tidak tersimpan lagi. TTL
+membatasi seberapa lama perubahan dari proses lain belum terlihat.
+
+`get_user_directory` menyediakan direktori user per halaman (keyset
+pada `username`) dengan pencarian prefix.
+"""
+
+import sys
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import LRUCache
+from app.core.pagination import DEFAULT_PAGE_SIZE, decode_value_cursor, encode_value_cursor
+from app.database.models import User
+from app.repositories import async_user_repository, user_repository
+from app.schema.user_schema import UserPage, UserResponse
+
+USERNAME_CACHE_TTL = 300
+# Username pengganti untuk user yang sudah tidak ada
+UNKNOWN_USERNAME = "Unknown"
+
+username_cache = LRUCache(maxsize=10000, ttl=USERNAME_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _queue_username_invalidation(mapper, connection, target):
+    """Hook ORM: catat user yang diubah/dihapus; cache dihapus setelah commit.
+
+    Flush terjadi sebelum commit, sehingga menghapus cache di sini masih
+    memberi kesempatan pembaca lain mengisinya lagi dengan row lama.
+    """
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_usernames_after_commit(session):
+    """Hook session: hapus username user yang berubah setelah commit."""
+    for user_id in session.info.pop("changed_user_ids", ()):
+        username_cache.delete(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_username_invalidations(session):
+    """Hook session: perubahan yang di-rollback tidak perlu menghapus cache."""
+    session.info.pop("changed_user_ids", None)
+
+
+def get_usernames(db: Session, user_ids: Iterable[int]) -> Dict[int, str]:
+    """Mengambil username banyak user sekaligus.
+    
+    Args:
+        db (Session): Database session
+        user_ids (Iterable[int]): ID user (boleh duplikat / berisi None)
+        
+    Returns:
+        Dict[int, str]: Username per ID user; user yang tidak ditemukan
+            tidak ada di dict
+    """
+    usernames, missing = _cached_usernames(user_ids)
+    if missing:
+        generation = username_cache.generation()
+        _store_usernames(usernames, user_repository.get_usernames(db, missing), generation)
+    return usernames
+
+
+async def get_usernames_async(db: AsyncSession, user_ids: Iterable[int]) -> Dict[int, str]:
+    """Seperti `get_usernames`, tetapi query-nya lewat AsyncSession."""
+    usernames, missing = _cached_usernames(user_ids)
+    if missing:
+        generation = username_cache.generation()
+        rows = await async_user_repository.get_usernames(db, missing)
+        _store_usernames(usernames, rows, generation)
+    return usernames
+
+
+def _cached_usernames(user_ids):
+    """Memisahkan ID yang username-nya ter-cache dari yang belum."""
+    usernames = {}
+    missing = set()
+    for user_id in user_ids:
+        if user_id is None or user_id in usernames:
+            continue
+        username = username_cache.get(user_id)
+        if username is None:
+            missing.add(user_id)
+        else:
+            usernames[user_id] = username
+    return usernames, missing
+
+
+def _store_usernames(usernames, rows, generation):
+    """Mengisi cache (dengan cek generation) dan `usernames` dari row database."""
+    for row in rows:
+        username_cache.set(row.id, row.username, generation=generation)
+        usernames[row.id] = row.username
+
+
+def get_username(db: Session, user_id: int) -> Optional[str]:
+    """Mengambil username satu user.
+    
+    Args:
+        db (Session): Database session
+        user_id (int): ID user
+        
+    Returns:
+        Optional[str]: Username, None jika user tidak ditemukan
+    """
+    return get_usernames(db, (user_id,)).get(user_id)
+
+
+async def get_username_async(db: AsyncSession, user_id: int) -> Optional[str]:
+    """Seperti `get_username`, tetapi query-nya lewat AsyncSession."""
+    return (await get_usernames_async(db, (user_id,))).get(user_id)
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """String terkecil yang lebih besar dari semua string berawalan `prefix`.
+    
+    U+10FFFF tidak punya penerus, jadi karakter itu dibuang dan karakter
+    sebelumnya yang dinaikkan; None jika prefix hanya berisi U+10FFFF
+    (tidak ada batas atas). Surrogate dilompati karena tidak bisa
+    di-encode ke UTF-8.
+    """
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if code <= sys.maxunicode:
+            if 0xD800 <= code <= 0xDFFF:
+                code = 0xE000
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+
+def get_user_directory(
+    db: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    prefix: Optional[str] = None
+):
+    """Mengambil satu halaman direktori user, urut username.
+    
+    Keyset pagination pada unique index `users.username`: halaman
+    berikutnya dimulai setelah username terakhir (`username > cursor`)
+    dan pencarian prefix menjadi range `prefix <= username < batas atas`,
+    sehingga biaya setiap halaman O(limit) berapa pun jumlah user.
+    Pencarian prefix mengikuti collation kolom (case-sensitive di SQLite).
+    
+    Args:
+        db (Session): Database session
+        limit (int): Jumlah maksimal user per halaman
+        cursor (Optional[str]): Cursor dari halaman sebelumnya
+        prefix (Optional[str]): Hanya user dengan username berawalan ini
+        
+    Returns:
+        UserPage: User pada halaman ini dan cursor halaman berikutnya
+        
+    Raises:
+        HTTPException: 400 jika cursor tidak valid
+    """
+    query = db.query(User.id, User.username)
+    if prefix:
+        query = query.filter(User.username >= prefix)
+        upper_bound = _prefix_upper_bound(prefix)
+        if upper_bound is not None:
+            query = query.filter(User.username < upper_bound)
+    if cursor:
+        query = query.filter(User.username > decode_value_cursor(cursor))
+
+    # Satu row ekstra menandakan masih ada halaman berikutnya
+    generation = username_cache.generation()
+    rows = query.order_by(User.username).limit(limit + 1).all()
+    items = []
+    for row in rows[:limit]:
+        username_cache.set(row.id, row.username, generation=generation)
+        items.append(UserResponse(id=row.id, username=row.username))
+
+    return UserPage(
+        items=items,
+        next_cursor=encode_value_cursor(rows[limit - 1].username) if len(rows) > limit else None
+    )
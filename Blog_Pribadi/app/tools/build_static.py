@@ -0,0 +1,83 @@
+"""Build the frontend for production: hashed names and precompressed files.
+
+Copies the frontend into `frontend/dist/`:
+
+- `index.js`, `style.css` and `index.css` get a content hash in their
+  name (`index.3f2a9c1b7e.js`) so they can be cached forever
+  (`Cache-Control: immutable`).
+- The HTML pages keep their names, since they are linked and bookmarked,
+  but reference the hashed assets. They are revalidated with ETags.
+
+Every file also gets a `.gz` variant and, when the `brotli` package is
+installed, a `.br` variant. The app serves `frontend/dist/` at
+`/frontend` whenever it exists, so rerun this after changing the frontend:
+
+    python -m app.tools.build_static
+"""
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+from app.core.static import ENCODINGS, compress_variants
+
+FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "frontend"))
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+
+# Assets referenced by the pages that get content-hashed names
+ASSETS = ("index.js", "style.css", "index.css")
+
+
+def write_file(name: str, data: bytes):
+    """Write `name` and its precompressed variants into DIST_DIR.
+
+    Returns:
+        dict: Size in bytes per encoding (`identity`, `gzip`, `br`)
+    """
+    sizes = {"identity": len(data)}
+    with open(os.path.join(DIST_DIR, name), "wb") as file:
+        file.write(data)
+    variants = compress_variants(data)
+    for encoding, suffix in ENCODINGS:
+        if encoding in variants:
+            with open(os.path.join(DIST_DIR, name + suffix), "wb") as file:
+                file.write(variants[encoding])
+            sizes[encoding] = len(variants[encoding])
+    return sizes
+
+
+def main():
+    """Rebuild `frontend/dist/` and print the size of every file."""
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.makedirs(DIST_DIR)
+
+    manifest = {}
+    report = {}
+    for name in ASSETS:
+        with open(os.path.join(FRONTEND_DIR, name), "rb") as file:
+            data = file.read()
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+        manifest[name] = hashed
+        report[hashed] = write_file(hashed, data)
+
+    for path in sorted(glob.glob(os.path.join(FRONTEND_DIR, "*.html"))):
+        with open(path, "rb") as file:
+            html = file.read().decode("utf-8")
+        for name, hashed in manifest.items():
+            html = html.replace(f"/frontend/{name}", f"/frontend/{hashed}")
+        report[os.path.basename(path)] = write_file(os.path.basename(path), html.encode("utf-8"))
+
+    with open(os.path.join(DIST_DIR, "manifest.json"), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+
+    for name, sizes in report.items():
+        details = ", ".join(f"{encoding} {size}" for encoding, size in sizes.items())
+        print(f"{name:<28} {details}")
+    print(f"Wrote {len(report)} files to {DIST_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Recompute the denormalized comment counters on posts.
+
+`Post.comment_count` and `Post.last_commented_at` are maintained by the
+comment endpoints. If they ever drift (manual SQL, imports, crashes
+between statements) run this job to rebuild them from the comments table:
+
+    python -m app.tools.repair_counters
+"""
+
+from app.database.db import SessionLocal, init_db
+from app.repositories import post_repository
+
+
+def main():
+    """Rebuild all post comment counters and print how many were updated."""
+    init_db()
+    db = SessionLocal()
+    try:
+        updated = post_repository.recount_comment_stats(db)
+    finally:
+        db.close()
+    print(f"Recomputed comment counters for {updated} posts")
+
+
+if __name__ == "__main__":
+    main()
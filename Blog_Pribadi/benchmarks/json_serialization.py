@@ -0,0 +1,126 @@
+"""Benchmark: per-row JSON serialization cost of the posts listing.
+
+Serializes a page of posts the way `GET /posts` does by default
+(`PostResponse` per row, then FastAPI validating the page against the
+route's `response_model` and dumping it) and with the `FAST_JSON` path
+(plain dict per row encoded straight to bytes by `app.core.fast_json`):
+
+    python benchmarks/json_serialization.py --rows 100 --repeat 200
+
+No database queries are made while measuring; the rows are in-memory
+`Post` objects and their `category` comes from the in-memory category
+map (seeded once in a temporary database).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_rows(count: int):
+    """Build `count` (Post, username) tuples like the listing query returns."""
+    from app.database.models import Post
+
+    rows = []
+    for i in range(count):
+        post = Post(
+            id=i + 1,
+            title=f"Benchmark post {i}",
+            content="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20,
+            created_at=datetime(2024, 1, 1, 12, 0, i % 60, 123456),
+            author_id=1,
+            category_id=i % 5 or None,
+            comment_count=i % 7,
+            last_commented_at=None,
+        )
+        rows.append((post, "bench_user"))
+    return rows
+
+
+def seed_categories():
+    """Create the categories referenced by `make_rows` and load the category map."""
+    from sqlalchemy import insert
+
+    from app.database.db import SessionLocal, init_db
+    from app.database.models import Category
+    from app.services import category_service
+
+    init_db()
+    with SessionLocal() as db:
+        db.execute(insert(Category), [{"id": i, "name": f"Category {i}"} for i in range(1, 5)])
+        db.commit()
+    category_service.load_categories()
+
+
+def default_path(rows, route):
+    """Pydantic models + FastAPI response validation and serialization."""
+    from fastapi.routing import serialize_response
+
+    from app.schema.post_schema import PostPage
+    from app.services.post_service import build_post_response
+
+    page = PostPage(
+        items=[build_post_response(post, username) for post, username in rows],
+        next_cursor=None,
+    )
+    return asyncio.run(serialize_response(
+        field=route.response_field,
+        response_content=page,
+        exclude_unset=route.response_model_exclude_unset,
+        dump_json=True,
+    ))
+
+
+def fast_path(rows, route):
+    """Plain dicts encoded directly to JSON bytes."""
+    from app.core import fast_json
+    from app.services.post_service import post_data
+
+    return fast_json.dumps({
+        "items": [post_data(post, username) for post, username in rows],
+        "next_cursor": None,
+    })
+
+
+def measure(func, rows, route, repeat: int):
+    """Return the mean cost per row in microseconds."""
+    func(rows, route)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(rows, route)
+    return (time.perf_counter() - start) / (repeat * len(rows)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.chdir(tempfile.mkdtemp(prefix="blog-bench-"))
+    from app.core import fast_json
+    from app.routers.post_router import router
+
+    route = next(r for r in router.routes if r.path == "/posts/" and "GET" in r.methods)
+    seed_categories()
+    rows = make_rows(args.rows)
+
+    assert default_path(rows, route) == fast_path(rows, route), "fast path output differs"
+
+    before = measure(default_path, rows, route, args.repeat)
+    after = measure(fast_path, rows, route, args.repeat)
+    encoder = "orjson" if fast_json.orjson is not None else "json (stdlib)"
+    print(f"rows per page : {args.rows}")
+    print(f"default       : {before:7.2f} us/row")
+    print(f"fast path     : {after:7.2f} us/row  ({encoder}, {before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
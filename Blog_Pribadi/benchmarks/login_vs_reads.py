@@ -0,0 +1,88 @@
+"""Benchmark: login throughput vs. concurrent read latency.
+
+Runs a burst of concurrent `/auth/login` requests while a reader keeps
+hitting `GET /posts/{id}`, and reports login throughput and read latency
+percentiles. Compare the hashing process pool against the inline
+(threadpool) mode:
+
+    python benchmarks/login_vs_reads.py                  # process pool
+    PASSWORD_HASH_WORKERS=0 python benchmarks/login_vs_reads.py  # threadpool
+
+The benchmark runs in a temporary directory so it never touches the
+development `blog.db`.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    """Return the `pct` percentile of `values` (nearest-rank)."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run(logins: int, concurrency: int):
+    import httpx
+    from app.main import app, lifespan
+
+    transport = httpx.ASGITransport(app=app)
+    async with lifespan(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        credentials = {"username": "bench_user", "password": "bench-password"}
+        await client.post("/auth/register", json=credentials)
+        headers = {"Authorization": "Bearer " + (await client.post("/auth/login", json=credentials)).json()["access_token"]}
+        post_id = (await client.post("/posts/", json={"title": "bench", "content": "bench"}, headers=headers)).json()["id"]
+
+        read_latencies = []
+        statuses = {}
+        done = asyncio.Event()
+
+        async def reader():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get(f"/posts/{post_id}")
+                read_latencies.append((time.perf_counter() - start) * 1000)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def login():
+            async with semaphore:
+                response = await client.post("/auth/login", json=credentials)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        reader_task = asyncio.create_task(reader())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await reader_task
+
+    print(f"hash workers        : {os.getenv('PASSWORD_HASH_WORKERS', 'default')}")
+    print(f"logins              : {logins} in {elapsed:.2f}s ({logins / elapsed:.1f}/s), statuses {statuses}")
+    print(f"reads during burst  : {len(read_latencies)}")
+    if read_latencies:
+        print(f"read latency (ms)   : p50={statistics.median(read_latencies):.2f} "
+              f"p95={percentile(read_latencies, 95):.2f} p99={percentile(read_latencies, 99):.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.chdir(tempfile.mkdtemp(prefix="blog-bench-"))
+    asyncio.run(run(args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,31 @@
 const API_URL = 'http://localhost:8000';
 let currentUser = null;
 let allPosts = [];
+let nextCursor = null; // Cursor halaman berikutnya dari GET /posts
+const POSTS_PAGE_SIZE = 20;
+const POST_PREVIEW_LENGTH = 200; // Panjang excerpt di feed
+const FEED_COMMENTS_PER_POST = 5;
 let allCategories = []; // Cache untuk kategori
 let usersCache = {}; // Cache untuk menyimpan data user
 let viewMode = 'list'; // 'list' atau 'grid'
 let searchQuery = ''; // Current search query
+let searchResults = null; // Hasil GET /posts/search untuk searchResultsQuery
+let searchResultsQuery = '';
+let searchTimer = null;
+const SEARCH_DEBOUNCE_MS = 300;
 let selectedCategory = ''; // Selected category filter
 
+/**
+ * Header untuk request baca (GET)
+ * Token ikut dikirim agar server melayani user yang baru menulis dari
+ * database primary, bukan dari replica yang mungkin tertinggal
+ * (read-your-writes)
+ */
+function readHeaders(headers = {}) {
+    const token = localStorage.getItem('token');
+    return token ? { ...headers, 'Authorization': `Bearer ${token}` } : headers;
+}
+
 // ============================================
 // INITIALIZATION
 // ============================================
@@ -42,7 +61,9 @@ function setupEventListeners() {
     if (searchInput) {
         searchInput.addEventListener('input', (e) => {
             searchQuery = e.target.value.toLowerCase().trim();
-            filterAndDisplayPosts();
+            // Cari di server (full-text) setelah user berhenti mengetik
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(searchPostsOnServer, SEARCH_DEBOUNCE_MS);
         });
     }
 
@@ -59,9 +80,13 @@ function setupEventListeners() {
     // Category filter event listener
     const categoryFilter = document.getElementById('categoryFilter');
     if (categoryFilter) {
-        categoryFilter.addEventListener('change', (e) => {
+        categoryFilter.addEventListener('change', async (e) => {
             selectedCategory = e.target.value;
-            filterAndDisplayPosts();
+            // Muat ulang feed dari listing per kategori di server
+            await loadPosts();
+            if (searchQuery) {
+                filterAndDisplayPosts();
+            }
         });
     }
 
@@ -119,8 +144,10 @@ function applyViewMode() {
 function filterAndDisplayPosts() {
     const searchInfo = document.getElementById('searchInfo');
 
-    // Start with all posts
-    let filteredPosts = allPosts;
+    // Pakai hasil full-text search server jika tersedia untuk query ini,
+    // selain itu mulai dari semua post yang sudah dimuat
+    const useServerResults = searchQuery && searchResults && searchResultsQuery === searchQuery;
+    let filteredPosts = useServerResults ? searchResults : allPosts;
 
     // Filter by kategori jika selected
     if (selectedCategory) {
@@ -129,11 +156,11 @@ function filterAndDisplayPosts() {
         );
     }
 
-    // Filter berdasarkan search query
-    if (searchQuery) {
+    // Filter lokal berdasarkan search query (fallback jika pencarian server gagal)
+    if (searchQuery && !useServerResults) {
         filteredPosts = filteredPosts.filter(post => {
             const title = (post.title || '').toLowerCase();
-            const content = (post.content || '').toLowerCase();
+            const content = (post.content || post.excerpt || '').toLowerCase();
             return title.includes(searchQuery) || content.includes(searchQuery);
         });
     }
@@ -170,6 +197,50 @@ function filterAndDisplayPosts() {
     }
 }
 
+/**
+ * Cari postingan di server lewat GET /posts/search (full-text, terurut relevansi)
+ * lalu tampilkan hasilnya. Jika gagal, filterAndDisplayPosts memakai filter lokal.
+ */
+async function searchPostsOnServer() {
+    const query = searchQuery;
+    if (!query) {
+        searchResults = null;
+        filterAndDisplayPosts();
+        return;
+    }
+    
+    try {
+        const params = new URLSearchParams({ q: query, limit: 50 });
+        const response = await fetch(`${API_URL}/posts/search?${params}`, { headers: readHeaders() });
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const page = await response.json();
+        // Abaikan respons lama jika user sudah mengetik query lain
+        if (query !== searchQuery) return;
+        
+        searchResults = page.items.map(item => ({
+            ...item,
+            content: item.snippet.replace(/<\/?mark>/g, '')
+        }));
+        searchResultsQuery = query;
+    } catch (error) {
+        console.error('❌ Error searching posts:', error);
+        searchResults = null;
+    }
+    filterAndDisplayPosts();
+}
+
+/**
+ * Ubah tag <mark> yang sudah di-escape kembali menjadi tag HTML
+ * 
+ * @param {string} escapedHtml - Text hasil escapeHtml
+ * @returns {string} HTML dengan highlight pencarian
+ */
+function restoreMarks(escapedHtml) {
+    return escapedHtml.replace(/&lt;(\/?)mark&gt;/g, '<$1mark>');
+}
+
 /**
  * Escape HTML untuk mencegah XSS attacks
  * Mengkonversi HTML special characters ke entities
@@ -324,29 +395,9 @@ async function getUserById(userId) {
     }
     
     console.log(`🔄 Fetching user data for ID: ${userId}`);
-    
-    // Coba berbagai endpoint untuk get user
-    const endpoints = [
-        `${API_URL}/users/${userId}`,
-        `${API_URL}/user/${userId}`,
-        `${API_URL}/auth/users/${userId}`,
-        `${API_URL}/auth/user/${userId}`
-    ];
-    
-    for (const endpoint of endpoints) {
-        try {
-            const response = await fetch(endpoint);
-            console.log(`Trying ${endpoint}: ${response.status}`);
-            
-            if (response.ok) {
-                const userData = await response.json();
-                console.log(`✅ User data found:`, userData);
-                usersCache[userId] = userData;
-                return userData;
-            }
-        } catch (err) {
-            console.log(`Endpoint ${endpoint} not accessible`);
-        }
+    await resolveUsers([userId]);
+    if (usersCache[userId]) {
+        return usersCache[userId];
     }
     
     // Jika tidak ditemukan, return default
@@ -359,66 +410,61 @@ async function getUserById(userId) {
     return defaultUser;
 }
 
-// Fungsi untuk mendapatkan semua users (untuk caching)
-async function getAllUsers() {
-    console.log('🔄 Fetching all users...');
-    
-    const endpoints = [
-        `${API_URL}/users`,
-        `${API_URL}/auth/users`
-    ];
+// Ambil username banyak user sekaligus (satu request GET /users/?ids=)
+async function resolveUsers(userIds) {
+    const missing = [...new Set(userIds.filter(id => id && !usersCache[id]))];
+    if (missing.length === 0) {
+        return;
+    }
     
-    for (const endpoint of endpoints) {
-        try {
-            const response = await fetch(endpoint);
-            console.log(`Trying ${endpoint}: ${response.status}`);
-            
-            if (response.ok) {
-                const users = await response.json();
-                console.log(`✅ Found ${users.length} users`);
-                
-                // Simpan ke cache
-                users.forEach(user => {
-                    if (user.id) {
-                        usersCache[user.id] = user;
-                    }
-                });
-                return users;
-            }
-        } catch (err) {
-            console.log(`Endpoint ${endpoint} not accessible`);
+    try {
+        const response = await fetch(`${API_URL}/users/?ids=${missing.join(',')}`, { headers: readHeaders() });
+        if (!response.ok) {
+            console.log(`⚠️ Could not resolve users: ${response.status}`);
+            return;
         }
+        const users = await response.json();
+        users.forEach(user => {
+            usersCache[user.id] = user;
+        });
+    } catch (err) {
+        console.log('⚠️ Could not resolve users', err);
     }
-    
-    console.log('❌ No user endpoint found');
-    return [];
 }
 
 // ============================================
 // FUNGSI UNTUK POSTS
 // ============================================
 
-// Ambil semua postingan dari backend
-async function fetchPostsFromBackend() {
+// Ambil satu halaman postingan dari backend (terbaru dulu)
+async function fetchPostsFromBackend(cursor = null) {
     try {
-        console.log('📡 Fetching posts from:', `${API_URL}/posts`);
-        const response = await fetch(`${API_URL}/posts`, {
-            headers: {
+        const baseUrl = selectedCategory
+            ? `${API_URL}/categories/${encodeURIComponent(selectedCategory)}/posts`
+            : `${API_URL}/posts`;
+        let url = `${baseUrl}?limit=${POSTS_PAGE_SIZE}`;
+        if (!selectedCategory) {
+            // Feed hanya menampilkan preview: minta excerpt, bukan konten penuh
+            url += `&view=summary&excerpt_length=${POST_PREVIEW_LENGTH}`;
+        }
+        if (cursor) {
+            url += `&cursor=${encodeURIComponent(cursor)}`;
+        }
+        console.log('📡 Fetching posts from:', url);
+        const response = await fetch(url, {
+            headers: readHeaders({
                 'Accept': 'application/json'
-            }
+            })
         });
         
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         
-        const posts = await response.json();
-        // Sort posts by newest first (created_at/date/createdAt)
-        posts.sort((a, b) => {
-            const da = new Date(a.created_at || a.date || a.createdAt || 0).getTime();
-            const db = new Date(b.created_at || b.date || b.createdAt || 0).getTime();
-            return db - da;
-        });
+        // Backend sudah mengurutkan terbaru dulu dan mengembalikan cursor halaman berikutnya
+        const page = await response.json();
+        const posts = page.items;
+        nextCursor = page.next_cursor;
         console.log('📦 Received', posts.length, 'posts');
         
         // Debug: lihat struktur post pertama
@@ -426,12 +472,14 @@ async function fetchPostsFromBackend() {
             console.log('🔍 First post structure:', posts[0]);
         }
         
-        // Coba ambil semua user untuk caching
-        setTimeout(() => {
-            getAllUsers().catch(() => {
-                console.log('⚠️ Could not fetch all users, will fetch individually');
-            });
-        }, 1000);
+        // Username penulis sudah ikut di setiap post; penulis lain di
+        // halaman ini diambil sekaligus dengan satu request batch
+        posts.forEach(post => {
+            if (post.author_id && post.username) {
+                usersCache[post.author_id] = { id: post.author_id, username: post.username };
+            }
+        });
+        resolveUsers(posts.map(post => post.author_id));
         
         return posts;
         
@@ -465,7 +513,6 @@ function getAuthorInfo(post) {
 // Tampilkan postingan
 function displayPosts(posts) {
     const container = document.getElementById('postsContainer');
-    allPosts = posts;
     
     if (posts.length === 0) {
         displayEmptyState(posts);
@@ -495,8 +542,9 @@ function displayPosts(posts) {
         console.log(`📝 Post ${post.id}: isOwner=${isOwner}, currentUser.id=${currentUser?.id}, authorInfo.id=${authorInfo.id}`);
         
         // Potong konten untuk preview
-        const content = post.content || post.body || '';
-        const previewContent = content.length > 200 ? content.substring(0, 200) + '...' : content;
+        const content = post.content || post.excerpt || post.body || '';
+        const isTruncated = post.excerpt_truncated || content.length > POST_PREVIEW_LENGTH;
+        const previewContent = isTruncated ? content.substring(0, POST_PREVIEW_LENGTH) + '...' : content;
         
         const postElement = document.createElement('div');
         postElement.className = 'post-card';
@@ -514,7 +562,7 @@ function displayPosts(posts) {
             ` : ''}
             
             <div class="post-header">
-                <h2 class="post-title">${escapeHtml(post.title || 'No Title')}</h2>
+                <h2 class="post-title">${post.title_highlight ? restoreMarks(escapeHtml(post.title_highlight)) : escapeHtml(post.title || 'No Title')}</h2>
                 
                 <div class="author-info">
                     <div class="author-avatar" style="background: linear-gradient(135deg, #${stringToColor(authorInfo.username)} 0%, #${stringToColor(authorInfo.username, true)} 100%);">
@@ -540,19 +588,19 @@ function displayPosts(posts) {
                         </span>
                     ` : ''}
                     <span style="color: #666; font-size: 12px;">
-                        ${post.content && post.content.length > 200 ? '📖 Baca selengkapnya...' : ''}
+                        ${isTruncated ? '📖 Baca selengkapnya...' : ''}
                     </span>
                 </div>
             </div>
             
             <div class="post-content-preview">
-                ${escapeHtml(previewContent)}
+                ${post.snippet ? restoreMarks(escapeHtml(post.snippet)) : escapeHtml(previewContent)}
             </div>
             
             <!-- Comments Section -->
             <div class="comments-section" style="margin-top: 20px; padding-top: 20px; border-top: 1px solid #eee;">
                 <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 15px;">
-                    <h4 style="margin: 0;">💬 Komentar</h4>
+                    <h4 style="margin: 0;">💬 Komentar${post.comment_count ? ` (${post.comment_count})` : ''}</h4>
                     <button class="toggle-comments-btn" data-post-id="${post.id}" title="Sembunyikan/Tampilkan komentar">
                         ▼
                     </button>
@@ -585,17 +633,31 @@ function displayPosts(posts) {
         `;
         
         container.appendChild(postElement);
-        
-        // Load comments untuk post ini
-        loadCommentsForPost(post.id);
     });
     
+    // Post tanpa komentar (menurut comment_count) tidak perlu di-fetch
+    posts.filter(post => post.comment_count === 0).forEach(post => displayComments(post.id, []));
+    
+    // Load komentar post lainnya di halaman ini dalam satu request
+    loadCommentsForPosts(posts.filter(post => post.comment_count !== 0).map(post => post.id));
+    
     // Tambahkan event listeners
     addPostEventListeners();
     addCommentEventListeners();
     
     // Update footer stats
     updateStats(posts);
+    updateLoadMoreButton();
+}
+
+// Tampilkan tombol "muat lebih banyak" jika masih ada halaman berikutnya
+function updateLoadMoreButton() {
+    const loadMoreContainer = document.getElementById('loadMoreContainer');
+    if (!loadMoreContainer) return;
+    
+    loadMoreContainer.innerHTML = nextCursor ? `
+        <button class="btn btn-secondary" onclick="loadMorePosts()">⬇️ Muat lebih banyak</button>
+    ` : '';
 }
 
 // Helper function untuk generate color dari string
@@ -656,13 +718,89 @@ function displayEmptyState(posts = [], isSearchEmpty = false) {
 // COMMENTS FUNCTIONS
 // ============================================
 
-// Load komentar untuk post tertentu
+// Thread komentar yang sudah dibuka per post: { comments, nextCursor }
+const commentThreads = {};
+
+// Ambil satu halaman komentar (terlama dulu); null jika gagal
+async function fetchCommentPage(postId, cursor = null) {
+    const params = new URLSearchParams();
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`${API_URL}/comments/posts/${postId}?${params}`, { headers: readHeaders() });
+    return response.ok ? response.json() : null;
+}
+
+// Load halaman pertama komentar untuk post tertentu
 async function loadCommentsForPost(postId) {
     try {
-        const response = await fetch(`${API_URL}/comments/posts/${postId}`);
+        const page = await fetchCommentPage(postId);
+        if (page) {
+            commentThreads[postId] = { comments: page.items, nextCursor: page.next_cursor };
+            displayComments(postId, page.items, page.next_cursor !== null);
+        }
+    } catch (error) {
+        console.error('Error loading comments:', error);
+    }
+}
+
+// Load halaman komentar berikutnya dengan mengikuti next_cursor
+async function loadMoreComments(postId) {
+    const thread = commentThreads[postId];
+    if (!thread || !thread.nextCursor) return;
+    
+    try {
+        const page = await fetchCommentPage(postId, thread.nextCursor);
+        if (page) {
+            thread.comments = thread.comments.concat(page.items);
+            thread.nextCursor = page.next_cursor;
+            displayComments(postId, thread.comments, thread.nextCursor !== null);
+        }
+    } catch (error) {
+        console.error('Error loading comments:', error);
+    }
+}
+
+// Muat ulang thread setelah menulis komentar. Halaman diikuti sampai
+// sebanyak yang sudah tampil, atau sampai habis jika `toEnd` (komentar
+// baru selalu berada di halaman terakhir).
+async function reloadCommentThread(postId, toEnd = false) {
+    const shown = commentThreads[postId] ? commentThreads[postId].comments.length : 0;
+    let comments = [];
+    let cursor = null;
+    
+    try {
+        do {
+            const page = await fetchCommentPage(postId, cursor);
+            if (!page) return;
+            comments = comments.concat(page.items);
+            cursor = page.next_cursor;
+        } while (cursor && (toEnd || comments.length < shown));
+        
+        commentThreads[postId] = { comments: comments, nextCursor: cursor };
+        displayComments(postId, comments, cursor !== null);
+    } catch (error) {
+        console.error('Error loading comments:', error);
+    }
+}
+
+// Load komentar terbaru untuk banyak post sekaligus (satu request untuk seluruh feed)
+async function loadCommentsForPosts(postIds) {
+    if (postIds.length === 0) return;
+    
+    try {
+        const params = new URLSearchParams({
+            post_ids: postIds.join(','),
+            per_post: FEED_COMMENTS_PER_POST
+        });
+        const response = await fetch(`${API_URL}/comments/?${params}`, { headers: readHeaders() });
         if (response.ok) {
-            const comments = await response.json();
-            displayComments(postId, comments);
+            const commentsByPost = await response.json();
+            postIds.forEach(postId => {
+                delete commentThreads[postId];
+                const comments = commentsByPost[postId] || [];
+                const post = allPosts.find(p => p.id === postId);
+                const total = post && post.comment_count !== undefined ? post.comment_count : comments.length;
+                displayComments(postId, comments, total > comments.length);
+            });
         }
     } catch (error) {
         console.error('Error loading comments:', error);
@@ -670,7 +808,7 @@ async function loadCommentsForPost(postId) {
 }
 
 // Tampilkan komentar
-function displayComments(postId, comments) {
+function displayComments(postId, comments, hasMore = false) {
     const commentsList = document.getElementById(`comments-${postId}`);
     if (!commentsList) return;
     
@@ -679,6 +817,11 @@ function displayComments(postId, comments) {
         return;
     }
     
+    // Preview feed membuka thread; thread yang sudah dibuka memuat halaman berikutnya
+    const moreButton = commentThreads[postId]
+        ? `<button class="btn btn-tiny" onclick="loadMoreComments(${postId})">💬 Muat komentar berikutnya</button>`
+        : `<button class="btn btn-tiny" onclick="loadCommentsForPost(${postId})">💬 Lihat semua komentar</button>`;
+    
     commentsList.innerHTML = comments.map(comment => {
         const isCommentOwner = currentUser && currentUser.id && 
                               currentUser.id.toString() === comment.user_id.toString();
@@ -706,7 +849,28 @@ function displayComments(postId, comments) {
                 </div>
             </div>
         `;
-    }).join('');
+    }).join('') + (hasMore ? moreButton : '');
+    
+    addCommentItemListeners(commentsList);
+}
+
+// Event listeners tombol edit/hapus di dalam satu daftar komentar
+function addCommentItemListeners(commentsList) {
+    commentsList.querySelectorAll('.delete-comment-btn').forEach(btn => {
+        btn.addEventListener('click', (e) => {
+            const commentId = btn.getAttribute('data-id');
+            const postId = btn.getAttribute('data-post-id');
+            deleteComment(commentId, postId);
+        });
+    });
+    
+    commentsList.querySelectorAll('.edit-comment-btn').forEach(btn => {
+        btn.addEventListener('click', (e) => {
+            const commentId = btn.getAttribute('data-id');
+            const postId = btn.getAttribute('data-post-id');
+            editComment(commentId, postId);
+        });
+    });
 }
 
 // Tambahkan event listeners untuk comments
@@ -732,24 +896,6 @@ function addCommentEventListeners() {
         });
     });
     
-    // Tombol delete komentar
-    document.querySelectorAll('.delete-comment-btn').forEach(btn => {
-        btn.addEventListener('click', (e) => {
-            const commentId = btn.getAttribute('data-id');
-            const postId = btn.getAttribute('data-post-id');
-            deleteComment(commentId, postId);
-        });
-    });
-    
-    // Tombol edit komentar
-    document.querySelectorAll('.edit-comment-btn').forEach(btn => {
-        btn.addEventListener('click', (e) => {
-            const commentId = btn.getAttribute('data-id');
-            const postId = btn.getAttribute('data-post-id');
-            editComment(commentId, postId);
-        });
-    });
-    
     // Toggle comments visibility
     document.querySelectorAll('.toggle-comments-btn').forEach(btn => {
         btn.addEventListener('click', (e) => {
@@ -793,8 +939,7 @@ async function addComment(postId, content, inputElement) {
         
         if (response.ok) {
             inputElement.value = '';
-            await loadCommentsForPost(postId);
-            addCommentEventListeners();
+            await reloadCommentThread(postId, true);
         } else {
             const error = await response.json();
             alert(`Gagal menambah komentar: ${error.detail}`);
@@ -823,8 +968,7 @@ async function editComment(commentId, postId) {
         });
         
         if (response.ok) {
-            await loadCommentsForPost(postId);
-            addCommentEventListeners();
+            await reloadCommentThread(postId);
         } else {
             const error = await response.json();
             alert(`Gagal edit komentar: ${error.detail}`);
@@ -850,8 +994,7 @@ async function deleteComment(commentId, postId) {
         });
         
         if (response.ok) {
-            await loadCommentsForPost(postId);
-            addCommentEventListeners();
+            await reloadCommentThread(postId);
         } else {
             const error = await response.json();
             alert(`Gagal hapus komentar: ${error.detail}`);
@@ -905,9 +1048,9 @@ async function loadCategories() {
     try {
         const response = await fetch(`${API_URL}/categories/`, {
             method: 'GET',
-            headers: {
+            headers: readHeaders({
                 'Content-Type': 'application/json'
-            }
+            })
         });
 
         if (response.ok) {
@@ -955,6 +1098,7 @@ async function loadPosts() {
         // Load preferred view mode
         loadPreferredViewMode();
         
+        allPosts = posts;
         if (posts.length === 0) {
             displayEmptyState(posts);
         } else {
@@ -977,6 +1121,20 @@ async function loadPosts() {
     }
 }
 
+// Muat halaman postingan berikutnya dan tambahkan ke daftar
+async function loadMorePosts() {
+    if (!nextCursor) return;
+    
+    try {
+        const morePosts = await fetchPostsFromBackend(nextCursor);
+        allPosts = allPosts.concat(morePosts);
+        filterAndDisplayPosts();
+    } catch (error) {
+        console.error('❌ Error loading more posts:', error);
+        showMessage('❌ Gagal memuat postingan berikutnya', 'error');
+    }
+}
+
 // Hapus postingan
 async function deletePost(postId) {
     if (!confirm('Apakah Anda yakin ingin menghapus postingan ini?')) {
@@ -1041,6 +1199,7 @@ function loadSampleData() {
     usersCache[1] = { id: 1, username: "Admin" };
     usersCache[2] = { id: 2, username: "Penulis" };
     
+    allPosts = samplePosts;
     displayPosts(samplePosts);
     showMessage('⚠️ Menggunakan data contoh', 'warning');
 }
@@ -1049,6 +1208,9 @@ function loadSampleData() {
 window.deletePost = deletePost;
 window.editPost = editPost;
 window.loadPosts = loadPosts;
+window.loadMorePosts = loadMorePosts;
+window.loadCommentsForPost = loadCommentsForPost;
+window.loadMoreComments = loadMoreComments;
 window.loadSampleData = loadSampleData;
 
 // Debug helper function
@@ -1056,8 +1218,8 @@ window.testOwnerCheck = async function() {
     console.log('=== OWNER CHECK DEBUG ===');
     console.log('Current User:', currentUser);
     
-    const response = await fetch(`${API_URL}/posts`);
-    const posts = await response.json();
+    const response = await fetch(`${API_URL}/posts`, { headers: readHeaders() });
+    const posts = (await response.json()).items;
     
     if (posts.length > 0) {
         console.log('First Post:', posts[0]);
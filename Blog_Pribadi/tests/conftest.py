@@ -0,0 +1,62 @@
+"""Shared pytest fixtures.
+
+The suite runs against a throwaway SQLite database. `DATABASE_URL` is set
+before `app.main` is imported so every engine (sync and async) points at it,
+and query budgets are enforced (`QUERY_BUDGET_MODE=raise`). Run it again
+with `DB_ASYNC=true` in the environment to cover the AsyncSession mode.
+"""
+
+import itertools
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_tmpdir = tempfile.mkdtemp(prefix="blog-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("READ_REPLICA_URLS", None)
+# Endpoints that exceed their query_budget fail the test instead of logging
+os.environ["QUERY_BUDGET_MODE"] = "raise"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import post_service, user_service
+
+_user_counter = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty response and username caches."""
+    post_service.invalidate_post_cache()
+    user_service.username_cache.clear()
+    yield
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register and log in a fresh user; return its Authorization header."""
+    credentials = {"username": f"tester{next(_user_counter)}", "password": "secret123"}
+    assert client.post("/auth/register", json=credentials).status_code == 200
+    response = client.post("/auth/login", json=credentials)
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def post_id(client, auth_headers):
+    """Create a post owned by the `auth_headers` user and return its id."""
+    response = client.post("/posts/", json={"title": "Judul", "content": "Isi"}, headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()["id"]
@@ -0,0 +1,47 @@
+"""`DB_ASYNC=true`: request paths must not fall back to the sync engine."""
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.security import token_cache
+from app.database.db import SessionLocal, engine
+from app.database.models import Category
+from app.services import category_service
+
+pytestmark = pytest.mark.skipif(not settings.DB_ASYNC, reason="run with DB_ASYNC=true")
+
+
+@pytest.fixture
+def sync_statements():
+    """Statements executed on the sync engine while the test runs."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_cold_auth_and_category_reload_use_the_async_session(
+    client, auth_headers, post_id, sync_statements, monkeypatch
+):
+    # Created behind the map's back, as another worker would
+    with SessionLocal() as db:
+        category = Category(name=f"async-{post_id}")
+        db.add(category)
+        db.commit()
+        category_id = category.id
+    sync_statements.clear()
+    token_cache.clear()
+    # The new category is unknown to the map and must be reloaded on this request
+    monkeypatch.setattr(category_service, "MISS_RELOAD_INTERVAL", 0)
+
+    response = client.put(
+        f"/posts/{post_id}", json={"title": "Baru", "content": "Isi", "category_id": category_id}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["category"] == {"id": category_id, "name": f"async-{post_id}"}
+    assert sync_statements == []
@@ -0,0 +1,33 @@
+"""NDJSON bulk import."""
+
+import json
+
+import pytest
+
+from app.database.db import SessionLocal
+from app.database.models import Post
+from app.tools.bulk import import_rows
+
+
+def ndjson(*records):
+    return [json.dumps({"table": table, "row": row}) + "\n" for table, row in records]
+
+
+def test_rejected_chunk_still_recounts_committed_comments():
+    lines = ndjson(
+        ("users", {"id": 900001, "username": "bulk", "password": "x"}),
+        ("posts", {"id": 900001, "title": "t", "content": "c", "author_id": 900001}),
+        ("comments", {"id": 900001, "content": "k", "user_id": 900001, "post_id": 900001}),
+        ("comments", {"id": 900001, "content": "duplicate", "user_id": 900001, "post_id": 900001}),
+    )
+    with pytest.raises(SystemExit):
+        import_rows(lines, chunk_size=3)
+
+    with SessionLocal() as db:
+        assert db.get(Post, 900001).comment_count == 1
+
+
+@pytest.mark.parametrize("line", ['[1, 2]\n', '"x"\n', '{"table": "users", "row": [1]}\n'])
+def test_non_object_line_is_reported_with_its_line_number(line):
+    with pytest.raises(SystemExit, match="Line 1: invalid record"):
+        import_rows([line], chunk_size=10)
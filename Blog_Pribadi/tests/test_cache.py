@@ -0,0 +1,56 @@
+"""LRUCache and the invalidation race in the post caches."""
+
+import pytest
+
+from app.core.cache import CacheBackend, LRUCache
+from app.database.db import SessionLocal
+from app.services import post_service
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_set_after_delete_is_dropped():
+    cache = LRUCache()
+    generation = cache.generation()
+    cache.delete("a")
+    cache.set("a", "stale", generation=generation)
+    cache.set("b", "fresh", generation=generation)
+    assert cache.get("a") is None
+    assert cache.get("b") == "fresh"
+
+
+def test_set_after_clear_is_dropped():
+    cache = LRUCache()
+    generation = cache.generation()
+    cache.clear()
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is None
+    cache.set("a", "fresh", generation=cache.generation())
+    assert cache.get("a") == "fresh"
+
+
+def test_forgotten_deletes_are_treated_as_recent():
+    cache = LRUCache(maxsize=2)
+    generation = cache.generation()
+    for key in ("a", "b", "c"):
+        cache.delete(key)
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is None
+
+
+def test_detail_read_racing_an_edit_is_not_cached(client, post_id, monkeypatch):
+    fetch_post = post_service._fetch_post
+
+    def fetch_then_edit(db, fetched_id):
+        row = fetch_post(db, fetched_id)
+        # Another request edits the post after this one has read it
+        post_service.invalidate_post_cache(fetched_id)
+        return row
+
+    monkeypatch.setattr(post_service, "_fetch_post", fetch_then_edit)
+    with SessionLocal() as db:
+        assert post_service.get_post_detail(db, post_id) is not None
+    assert post_service.post_detail_cache.get(str(post_id)) is None
@@ -0,0 +1,62 @@
+"""Query-count regression tests for the comment thread endpoint."""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.database.db import SessionLocal, engine
+from app.database.models import Comment, User
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements executed on the engine inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def seed_comments(post_id, count):
+    """Add `count` comments to a post, each written by a different user."""
+    with SessionLocal() as db:
+        users = [User(username=f"commenter{post_id}_{i}", password="x") for i in range(count)]
+        db.add_all(users)
+        db.flush()
+        db.add_all(
+            Comment(content=f"komentar {i}", user_id=user.id, post_id=post_id)
+            for i, user in enumerate(users)
+        )
+        db.commit()
+
+
+def thread_query_count(client, post_id, **params):
+    with count_queries() as statements:
+        response = client.get(f"/comments/posts/{post_id}", params=params)
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+def test_thread_query_count_does_not_grow_with_comments(client, auth_headers):
+    post_ids = []
+    for count in (3, 30):
+        response = client.post("/posts/", json={"title": "Judul", "content": "Isi"}, headers=auth_headers)
+        post_ids.append(response.json()["id"])
+        seed_comments(post_ids[-1], count)
+
+    few_queries, few = thread_query_count(client, post_ids[0])
+    many_queries, many = thread_query_count(client, post_ids[1])
+
+    assert len(few["items"]) == 3
+    assert len(many["items"]) == 20
+    assert few_queries == many_queries
+
+    next_page_queries, next_page = thread_query_count(client, post_ids[1], cursor=many["next_cursor"])
+    assert len(next_page["items"]) == 10
+    assert next_page_queries == few_queries
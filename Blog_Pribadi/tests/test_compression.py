@@ -0,0 +1,56 @@
+"""Response compression middleware."""
+
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+
+BODY = "blog " * 400
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("hi")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_gzip_response_has_weak_etag():
+    response = make_client().get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == BODY
+
+
+def test_streaming_response_is_compressed_per_chunk():
+    client = make_client()
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode() == BODY * 2
+
+
+def test_small_or_unaccepted_response_is_not_compressed():
+    client = make_client()
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    response = client.get("/text", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"] == '"abc"'
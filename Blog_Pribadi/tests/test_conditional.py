@@ -0,0 +1,71 @@
+"""ETag / Last-Modified must describe the body they are sent with."""
+
+import pytest
+
+from app.core.config import settings
+from app.database.db import SessionLocal
+from app.database.models import Post
+
+
+@pytest.fixture(params=[False, True], ids=["pydantic", "fast_json"])
+def fast_json(request, monkeypatch):
+    monkeypatch.setattr(settings, "FAST_JSON", request.param)
+    return request.param
+
+
+def rename_without_invalidating(post_id, title):
+    """Change a post the way another worker would: this process's cache is not told."""
+    with SessionLocal() as db:
+        db.get(Post, post_id).title = title
+        db.commit()
+
+
+def test_detail_body_matches_etag(client, post_id, fast_json):
+    first = client.get(f"/posts/{post_id}")
+    rename_without_invalidating(post_id, "Judul baru")
+
+    second = client.get(f"/posts/{post_id}")
+    assert second.headers["etag"] != first.headers["etag"]
+    assert second.json()["title"] == "Judul baru"
+
+
+@pytest.mark.parametrize("params", [{}, {"view": "summary"}, {"fields": "id,title"}])
+def test_listing_body_matches_etag(client, post_id, fast_json, params):
+    first = client.get("/posts/", params=params)
+    rename_without_invalidating(post_id, "Judul baru")
+
+    second = client.get("/posts/", params=params)
+    assert second.headers["etag"] != first.headers["etag"]
+    titles = {post["id"]: post["title"] for post in second.json()["items"]}
+    assert titles[post_id] == "Judul baru"
+
+
+def test_unchanged_post_is_not_modified(client, post_id):
+    etag = client.get(f"/posts/{post_id}").headers["etag"]
+    assert client.get(f"/posts/{post_id}", headers={"If-None-Match": etag}).status_code == 304
+
+
+# Later than any Last-Modified the server could have sent
+FUTURE = "Fri, 01 Jan 2100 00:00:00 GMT"
+
+
+def test_listing_is_not_304_by_date_after_a_delete(client, auth_headers, post_id):
+    first = client.get("/posts/", params={"limit": 100})
+    assert "last-modified" not in first.headers
+    assert client.delete(f"/posts/{post_id}", headers=auth_headers).status_code == 200
+
+    second = client.get("/posts/", params={"limit": 100}, headers={"If-Modified-Since": FUTURE})
+    assert second.status_code == 200
+    assert post_id not in {post["id"] for post in second.json()["items"]}
+
+
+def test_thread_is_not_304_by_date_after_a_delete(client, auth_headers, post_id):
+    created = client.post(f"/comments/posts/{post_id}", json={"content": "hapus"}, headers=auth_headers)
+    comment_id = created.json()["id"]
+    first = client.get(f"/comments/posts/{post_id}")
+    assert "last-modified" not in first.headers
+    assert client.delete(f"/comments/{comment_id}", headers=auth_headers).status_code == 200
+
+    second = client.get(f"/comments/posts/{post_id}", headers={"If-Modified-Since": FUTURE})
+    assert second.status_code == 200
+    assert second.json()["items"] == []
@@ -0,0 +1,27 @@
+"""Response cache behaviour of the post listings."""
+
+from app.database.db import SessionLocal
+from app.services import post_service
+
+
+def test_category_zero_does_not_poison_feed(client, post_id):
+    assert client.get("/categories/0/posts").status_code == 404
+    feed = client.get("/posts/").json()["items"]
+    assert post_id in [post["id"] for post in feed]
+
+
+def test_feed_is_not_served_for_category_zero(client, post_id):
+    assert client.get("/posts/").json()["items"]
+    assert client.get("/categories/0/posts").status_code == 404
+
+
+def test_feed_is_not_served_for_user_zero(client, post_id):
+    assert client.get("/posts/").json()["items"]
+    assert client.get("/users/0/posts").status_code == 404
+
+
+def test_summary_keys_distinguish_zero_filters(client, post_id):
+    with SessionLocal() as db:
+        assert post_service.get_post_summaries(db).items
+        assert post_service.get_post_summaries(db, category_id=0).items == []
+        assert post_service.get_post_summaries(db, author_id=0).items == []
@@ -0,0 +1,32 @@
+"""Per-endpoint query budgets."""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.database.db import SessionLocal
+from app.core.metrics import MetricsMiddleware, QueryBudgetExceeded, query_budget
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/queries/{count}", dependencies=[Depends(query_budget(2))])
+    def run_queries(count: int):
+        with SessionLocal() as db:
+            for _ in range(count):
+                db.execute(text("SELECT 1"))
+        return {"queries": count}
+
+    return TestClient(app)
+
+
+def test_endpoint_within_budget_succeeds():
+    assert make_client().get("/queries/2").status_code == 200
+
+
+def test_endpoint_over_budget_raises():
+    with pytest.raises(QueryBudgetExceeded, match="exceeded its query budget of 2"):
+        make_client().get("/queries/3")
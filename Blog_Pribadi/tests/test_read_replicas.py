@@ -0,0 +1,31 @@
+"""Read-your-writes routing and caching with a read replica configured."""
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.database import db
+from app.services import post_service
+
+pytestmark = pytest.mark.skipif(settings.DB_ASYNC, reason="read replicas are not used in async mode")
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Send read-only sessions to a second engine on the same database."""
+    replica_engine = create_engine(settings.DATABASE_URL)
+    monkeypatch.setattr(db.replicas, "choose", lambda: replica_engine)
+    yield replica_engine
+    replica_engine.dispose()
+
+
+def test_replica_reads_are_not_cached(client, post_id, replica):
+    assert client.get(f"/posts/{post_id}").status_code == 200
+    assert client.get("/posts/").status_code == 200
+    assert post_service.post_detail_cache.get(str(post_id)) is None
+    assert post_service.post_list_cache.stats()["size"] == 0
+
+
+def test_recent_writer_reads_primary_and_fills_cache(client, auth_headers, post_id, replica):
+    # `post_id` was just created with `auth_headers`, so this client is pinned
+    assert client.get(f"/posts/{post_id}", headers=auth_headers).status_code == 200
+    assert post_service.post_detail_cache.get(str(post_id)) is not None
@@ -0,0 +1,56 @@
+"""User directory endpoint."""
+
+import pytest
+
+from app.database.db import SessionLocal
+from app.database.models import User
+from app.services import user_service
+from app.services.user_service import _prefix_upper_bound
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("ab", "ac"),
+    ("a\U0010ffff", "b"),
+    ("\U0010ffff\U0010ffff", None),
+    ("\ud7ff", "\ue000"),
+])
+def test_prefix_upper_bound(prefix, expected):
+    assert _prefix_upper_bound(prefix) == expected
+
+
+@pytest.mark.parametrize("prefix", ["a\U0010ffff", "\U0010ffff", "\ud7ff"])
+def test_directory_accepts_prefix_without_successor(client, prefix):
+    response = client.get("/users/", params={"prefix": prefix})
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+
+def test_directory_prefix_search(client, auth_headers):
+    usernames = [user["username"] for user in client.get("/users/", params={"prefix": "tester"}).json()["items"]]
+    assert usernames
+    assert all(name.startswith("tester") for name in usernames)
+
+
+def test_username_read_before_commit_is_not_cached():
+    with SessionLocal() as writer:
+        user = User(username="rename-me", password="x")
+        writer.add(user)
+        writer.commit()
+
+        user.username = "renamed"
+        writer.flush()
+        with SessionLocal() as reader:
+            assert user_service.get_username(reader, user.id) == "rename-me"
+        writer.commit()
+
+        with SessionLocal() as reader:
+            assert user_service.get_username(reader, user.id) == "renamed"
+
+
+@pytest.mark.parametrize("params", [
+    {"ids": "1", "prefix": "al"},
+    {"ids": "1", "limit": 5},
+    {"ids": "1", "cursor": "abc"},
+])
+def test_ids_cannot_be_combined_with_directory_params(client, params):
+    assert client.get("/users/", params=params).status_code == 400